@@ -0,0 +1,244 @@
+"""Benchmarks for the command and recognition pipeline on simulated devices.
+
+Run from the repo root:
+
+    python -m benchmarks.bench
+    python -m benchmarks.bench --only command listen_once --save baseline.json
+    python -m benchmarks.bench --compare baseline.json --tolerance 0.25
+
+Microphone, camera, TTS, speech recognition and the image CDN are all
+replaced by local fakes (benchmarks/fakes.py), so numbers reflect Karen's
+own overhead. --recognizer-delay and --image-delay add simulated network
+latency. --compare exits with status 1 when p50 or p99 of any case is more
+than --tolerance slower than the saved baseline.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import (FakeCamera, FakeRecognizer, FakeTTS, ImageServer, WavMicrophone,
+                              write_utterance_wav)
+
+
+CASES = ('command', 'listen_once', 'show_image_cold', 'show_image_warm', 'camera_loop', 'camera_loop_streaming')
+# Commands replayed against /api/command, one practice round per animal
+COMMAND_SCRIPT = ('show me lion', 'lion', 'show me tiger', 'tiger', 'what can you do')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    return {
+        "n": len(latencies),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3)
+    }
+
+
+def timed(fn, iterations):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence Karen's per-command prints while timing"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def make_karen(args, **devices):
+    from speechRecognition.speech import Karen
+    return Karen(headless=True, engine=FakeTTS(), display=False,
+                 recognizer_backend=FakeRecognizer(delay=args.recognizer_delay / 1000.0), **devices)
+
+
+def bench_command(args, images):
+    """POST /api/command through the Flask app, one session per concurrent client"""
+    os.environ['KAREN_HEADLESS'] = '1'
+    os.environ.setdefault('KAREN_IMAGE_CACHE_DIR', tempfile.mkdtemp(prefix='karen-bench-'))
+    # Benchmark attempts must not land in the real progress database
+    os.environ.setdefault('KAREN_PROGRESS_DB', '')
+    import server
+    server.image_cache.sources = images.sources()
+    server.image_cache.clear()
+    # As at server startup
+    server.image_cache.prefetch(background=False, variants=False)
+
+    def client_run(index):
+        client = server.app.test_client()
+        headers = {'X-Session-Id': f'bench-session-{index:04d}'}
+        client.post('/api/start', headers=headers)
+        latencies = []
+        for i in range(args.iterations):
+            command = COMMAND_SCRIPT[i % len(COMMAND_SCRIPT)]
+            t = time.perf_counter()
+            response = client.post('/api/command', json={'command': command}, headers=headers)
+            latencies.append(time.perf_counter() - t)
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/command returned {response.status_code}")
+        client.post('/api/stop', headers=headers)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(client_run, range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    server.sessions.close_all()
+    return summarize([latency for latencies in results for latency in latencies], elapsed)
+
+
+def bench_listen_once(args, images):
+    karen = make_karen(args, microphone=WavMicrophone(args.wav, realtime=args.realtime))
+
+    def listen():
+        if karen.listen_once() is None:
+            raise RuntimeError("listen_once heard nothing; check the WAV fixture")
+
+    result = timed(listen, args.iterations)
+    karen.stop_interaction()
+    return result
+
+
+def bench_show_image(args, images, cold):
+    from speechRecognition.images import ImageCache
+    karen = make_karen(args, image_cache=ImageCache(images.sources()))
+    animals = list(images.sources())
+    counter = iter(range(10 ** 9))
+    if not cold:
+        karen.image_cache.prefetch(background=False, variants=False)
+
+    def show():
+        if cold:
+            karen.image_cache.clear()
+        if not karen.show_image(animals[next(counter) % len(animals)]):
+            raise RuntimeError(karen.status)
+
+    result = timed(show, args.iterations)
+    karen.stop_interaction()
+    return result
+
+
+def bench_camera_loop(args, images, streaming):
+    """Per-frame time of camera_loop (overlay render and, with a viewer, JPEG encode)"""
+    camera = FakeCamera(max_frames=args.frames)
+    karen = make_karen(args)
+    karen.update_state(current_animal='lion', last_heard='show me lion', listening=True)
+
+    viewer = None
+    received = []
+    if streaming:
+        # A subscriber before the first frame, so every frame is encoded
+        stream = karen.frames.stream(max_fps=0)
+        viewer = threading.Thread(target=lambda: received.extend(1 for _ in stream), daemon=True)
+        viewer.start()
+        while not karen.frames.subscribers:
+            time.sleep(0.001)
+
+    started = time.perf_counter()
+    karen.attach_camera(camera)
+    karen.camera_thread.join()
+    elapsed = time.perf_counter() - started
+    if viewer:
+        viewer.join(timeout=5)
+    karen.stop_interaction()
+
+    result = summarize(camera.frame_times(), elapsed)
+    if streaming:
+        result["frames_streamed"] = len(received)
+    return result
+
+
+def run(args):
+    results = {}
+    with ImageServer(['rabbit', 'lion', 'tiger', 'snake', 'lemon', 'rainbow'],
+                     delay=args.image_delay / 1000.0) as images:
+        for case in args.only:
+            print(f"[BENCH]: {case}...", file=sys.stderr)
+            with quiet():
+                if case == 'command':
+                    results[case] = bench_command(args, images)
+                elif case == 'listen_once':
+                    results[case] = bench_listen_once(args, images)
+                elif case.startswith('show_image'):
+                    results[case] = bench_show_image(args, images, cold=case.endswith('cold'))
+                elif case.startswith('camera_loop'):
+                    results[case] = bench_camera_loop(args, images, streaming=case.endswith('streaming'))
+    return results
+
+
+def print_table(results):
+    print(f"{'case':<24}{'n':>7}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for case, r in results.items():
+        print(f"{case:<24}{r['n']:>7}{r['throughput'] or 0:>10.1f}{r['p50_ms']:>10.3f}"
+              f"{r['p99_ms']:>10.3f}{r['mean_ms']:>10.3f}")
+
+
+def compare(results, baseline, tolerance):
+    """Regressions beyond tolerance, as printable lines"""
+    regressions = []
+    for case, r in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p99_ms'):
+            if base[key] and r[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{case} {key}: {base[key]:.3f} -> {r[key]:.3f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Karen pipeline benchmarks on simulated devices")
+    parser.add_argument('--only', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--iterations', type=int, default=200, help="timed calls per case (per client for command)")
+    parser.add_argument('--concurrency', type=int, default=4, help="concurrent sessions for /api/command")
+    parser.add_argument('--frames', type=int, default=300, help="frames per camera_loop case")
+    parser.add_argument('--wav', help="utterance to replay as the microphone (default: synthetic)")
+    parser.add_argument('--realtime', action='store_true', help="pace the fake microphone like a live device")
+    parser.add_argument('--recognizer-delay', type=float, default=0.0, help="simulated recognition latency, ms")
+    parser.add_argument('--image-delay', type=float, default=0.0, help="simulated image download latency, ms")
+    parser.add_argument('--save', help="write results as JSON")
+    parser.add_argument('--compare', help="baseline JSON from --save")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='karen-bench-') as tmp:
+        if not args.wav:
+            args.wav = write_utterance_wav(os.path.join(tmp, 'utterance.wav'))
+        results = run(args)
+
+    print_table(results)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
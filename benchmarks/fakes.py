@@ -0,0 +1,278 @@
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import numpy as np
+import speech_recognition as sr
+
+from speechRecognition.recognizers import RecognitionStream, RecognizerBackend
+
+
+SAMPLE_RATE = 16000
+
+
+def write_utterance_wav(path, lead_s=0.4, speech_s=0.8, tail_s=0.8, sample_rate=SAMPLE_RATE, seed=0):
+    """Synthetic utterance: low noise, a voiced burst, then silence long enough to endpoint"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(speech_s * sample_rate)) / sample_rate
+    # Harmonics of a 140 Hz voice with a syllable-rate envelope
+    voiced = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    voiced *= 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    voiced = 0.3 * voiced / np.abs(voiced).max()
+
+    signal = np.concatenate([
+        rng.normal(0, 0.002, int(lead_s * sample_rate)),
+        voiced + rng.normal(0, 0.002, len(t)),
+        rng.normal(0, 0.002, int(tail_s * sample_rate))
+    ])
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+    return path
+
+
+# Broad phoneme class -> (RMS, energy share below 1 kHz, share above 4 kHz, voicing tone Hz or None)
+CLASS_SOUNDS = {
+    'silence': (0.005, 0.5, 0.5, None),
+    'vowel': (0.4, 0.7, 0.03, 450),
+    'approximant': (0.2, 0.65, 0.04, 350),
+    'nasal': (0.08, 0.9, 0.02, 120),
+    'fricative': (0.3, 0.15, 0.75, None),
+    'stop': (0.05, 0.4, 0.5, None)
+}
+
+
+def synthetic_word(word, phoneme_s=0.12, gap_s=0.1, sample_rate=SAMPLE_RATE, seed=0):
+    """int16 clip of a practice word, one segment per phoneme shaped like its broad class"""
+    from speechRecognition.pronunciation import CLASS_NAMES, CLASS_OF, LEXICON
+    rng = np.random.default_rng(seed)
+
+    def band(n, low, high):
+        spectrum = np.fft.rfft(rng.normal(0, 1, n))
+        freqs = np.fft.rfftfreq(n, 1.0 / sample_rate)
+        spectrum[(freqs < low) | (freqs >= high)] = 0
+        noise = np.fft.irfft(spectrum, n)
+        return noise / (noise.std() + 1e-12)
+
+    def segment(name, seconds):
+        n = int(seconds * sample_rate)
+        rms, low, high, tone = CLASS_SOUNDS[name]
+        t = np.arange(n) / sample_rate
+        if tone:
+            # Voiced: a low tone, a weaker formant and a little hiss
+            x = (np.sqrt(2 * low) * np.sin(2 * np.pi * tone * t)
+                 + np.sqrt(2 * (1 - low - high)) * np.sin(2 * np.pi * 1700 * t)
+                 + np.sqrt(high) * band(n, 4000, 8000))
+        else:
+            x = (np.sqrt(low) * band(n, 50, 1000) + np.sqrt(1 - low - high) * band(n, 1000, 4000)
+                 + np.sqrt(high) * band(n, 4000, sample_rate // 2))
+        return rms * x
+
+    parts = [segment('silence', gap_s)]
+    parts += [segment(CLASS_NAMES[CLASS_OF[phoneme]], phoneme_s) for phoneme in LEXICON[word]]
+    parts.append(segment('silence', gap_s))
+    return (np.clip(np.concatenate(parts), -1, 1) * 32767).astype(np.int16)
+
+
+class WavMicrophone(sr.AudioFile):
+    """Microphone stand-in replaying a WAV file, optionally paced like a live device"""
+
+    def __init__(self, path, realtime=False):
+        super().__init__(path)
+        self.realtime = realtime
+
+    def __enter__(self):
+        source = super().__enter__()
+        if self.realtime:
+            self.stream = _PacedStream(self.stream, self.SAMPLE_RATE)
+        return source
+
+
+class _PacedStream:
+    def __init__(self, stream, sample_rate):
+        self.stream = stream
+        self.sample_rate = sample_rate
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if size > 0:
+            time.sleep(size / self.sample_rate)
+        return data
+
+
+class FakeRecognizer(RecognizerBackend):
+    """Returns a fixed transcript after an optional simulated network delay"""
+    name = 'fake'
+
+    def __init__(self, transcript='show me lion', delay=0.0):
+        self.transcript = transcript
+        self.delay = delay
+
+    def start(self, vocabulary=None):
+        return _FakeStream(self)
+
+    def recognize(self, audio, vocabulary=None):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.transcript
+
+
+class _FakeStream(RecognitionStream):
+    def __init__(self, backend):
+        self.backend = backend
+        self.received = 0
+
+    def accept(self, audio):
+        self.received += len(audio.frame_data)
+        return None
+
+    def result(self):
+        if not self.received:
+            raise sr.UnknownValueError()
+        return self.backend.recognize(None)
+
+
+class FakeCamera:
+    """cv2.VideoCapture stand-in cycling through synthetic frames, closing after max_frames"""
+
+    def __init__(self, width=800, height=600, max_frames=300, variants=8, seed=0):
+        rng = np.random.default_rng(seed)
+        self.frames = [self.synthetic_frame(rng, width, height) for _ in range(variants)]
+        self.max_frames = max_frames
+        self.count = 0
+        # perf_counter of every read, frame time is the gap between reads
+        self.read_times = []
+        self.opened = True
+
+    @staticmethod
+    def synthetic_frame(rng, width, height, block=16):
+        # Smooth blocks plus sensor noise, so JPEG sizes are closer to a real scene than pure noise
+        coarse = rng.integers(0, 256, (height // block + 1, width // block + 1, 3)).astype(np.int16)
+        frame = coarse.repeat(block, axis=0).repeat(block, axis=1)[:height, :width]
+        frame += rng.integers(-6, 7, frame.shape, dtype=np.int16)
+        return np.clip(frame, 0, 255).astype(np.uint8)
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        if self.count >= self.max_frames:
+            self.opened = False
+            return False, image
+        self.read_times.append(time.perf_counter())
+        frame = self.frames[self.count % len(self.frames)]
+        self.count += 1
+        if image is None or image.shape != frame.shape:
+            image = frame.copy()
+        else:
+            np.copyto(image, frame)
+        return True, image
+
+    def release(self):
+        self.opened = False
+
+    def frame_times(self):
+        return [b - a for a, b in zip(self.read_times, self.read_times[1:])]
+
+
+class FakeTTS:
+    """pyttsx3 engine stand-in; playback sleeps seconds_per_word for every word said"""
+
+    def __init__(self, seconds_per_word=0.0):
+        self.seconds_per_word = seconds_per_word
+        self.pending = []
+        self.file_jobs = []
+
+    def getProperty(self, name):
+        return []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self.pending.append(text)
+
+    def save_to_file(self, text, path):
+        self.file_jobs.append((text, path))
+
+    def runAndWait(self):
+        for text in self.pending:
+            if self.seconds_per_word:
+                time.sleep(self.seconds_per_word * len(text.split()))
+        self.pending = []
+        for text, path in self.file_jobs:
+            with wave.open(path, 'wb') as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(SAMPLE_RATE)
+                f.writeframes(b'\0\0' * (SAMPLE_RATE // 10))
+        self.file_jobs = []
+
+    def stop(self):
+        self.pending = []
+
+
+def synthetic_jpeg(seed, size=(1200, 800)):
+    """A JPEG roughly the size of the Unsplash originals"""
+    from PIL import Image
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    img = Image.fromarray(pixels).resize(size)
+    buffer = BytesIO()
+    img.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class ImageServer:
+    """Local stand-in for the image CDN: serves /<name>.jpg from memory"""
+
+    def __init__(self, names, delay=0.0):
+        self.images = {f"/{name}.jpg": synthetic_jpeg(i) for i, name in enumerate(names)}
+        self.delay = delay
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = server.images.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+                if server.delay:
+                    time.sleep(server.delay)
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def sources(self):
+        """name -> URL, in the shape of ANIMAL_IMAGES"""
+        return {path[1:-4]: self.base_url + path for path in self.images}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
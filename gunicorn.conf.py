@@ -0,0 +1,26 @@
+# gunicorn -c gunicorn.conf.py server:app
+#
+# Sessions live in process memory, so more than one worker needs sticky
+# routing on the X-Session-Id header or karen_session cookie.
+import os
+
+bind = f"{os.environ.get('KAREN_HOST', '0.0.0.0')}:{os.environ.get('KAREN_PORT', '5000')}"
+workers = int(os.environ.get('KAREN_WORKERS', 1))
+# Threads rather than processes per worker: status streams hold a thread each
+worker_class = 'gthread'
+threads = int(os.environ.get('KAREN_THREADS', 64))
+keepalive = int(os.environ.get('KAREN_KEEPALIVE_TIMEOUT', 75))
+# Seconds before a silent worker is restarted. gthread workers keep signalling
+# while requests run, so this is not a per-request limit (see KAREN_REQUEST_TIMEOUT)
+timeout = int(os.environ.get('KAREN_WORKER_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('KAREN_SHUTDOWN_TIMEOUT', 10)) + 5
+
+
+def post_worker_init(worker):
+    from server import image_cache
+    image_cache.prefetch()
+
+
+def worker_exit(server, worker):
+    from server import shutdown
+    shutdown()
@@ -1,27 +1,272 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, g
 from flask_cors import CORS
-from speechRecognition.speech import Karen
+from speechRecognition.speech import Karen, CommandResult, ANIMAL_IMAGES, init_tts_engine
+from speechRecognition.images import ImageCache, VARIANT_SIZES, VARIANT_FORMATS
+from speechRecognition.tts import AudioCache, SpeechQueue
+from speechRecognition.recognizers import create_recognizer
+from speechRecognition.audio_input import decode_audio, iter_pcm_chunks, is_pcm, content_rate
+from speechRecognition.frames import FrameBroadcaster, BOUNDARY
+from speechRecognition.importtime import loaded_heavy_modules
+from speechRecognition.metrics import metrics
+from speechRecognition.progress import ProgressStore
+import speech_recognition as sr
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import threading
+import functools
 import logging
 import time
+import uuid
+import os
+import re
+import json
+import base64
+import signal
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, supports_credentials=True, expose_headers=['X-Session-Id'])
+# Largest accepted upload (audio clips), in bytes
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('KAREN_MAX_UPLOAD', 10 * 1024 * 1024))
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class KarenSystem:
+# Session settings
+SESSION_HEADER = 'X-Session-Id'
+SESSION_COOKIE = 'karen_session'
+MAX_SESSIONS = int(os.environ.get('KAREN_MAX_SESSIONS', 200))
+SESSION_IDLE_TIMEOUT = float(os.environ.get('KAREN_SESSION_IDLE_TIMEOUT', 900))
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+# Headless sessions run the command engine only, without mic/camera/TTS. Otherwise the first
+# started session owns the local devices and later ones stay headless. The desktop dev server
+# (python server.py) uses the devices by default, production serving and gunicorn do not
+DESKTOP_DEV = __name__ == '__main__' and os.environ.get('KAREN_SERVER', 'dev') != 'production'
+HEADLESS = os.environ.get('KAREN_HEADLESS', '0' if DESKTOP_DEV else '1') == '1'
+
+# Image cache settings, KAREN_OFFLINE serves images from local files only
+IMAGE_CACHE_DIR = os.environ.get('KAREN_IMAGE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'karen', 'images'))
+IMAGE_ASSET_DIR = os.environ.get('KAREN_IMAGE_ASSET_DIR')
+OFFLINE = os.environ.get('KAREN_OFFLINE', '0') == '1'
+IMAGE_MAX_AGE = int(os.environ.get('KAREN_IMAGE_MAX_AGE', 86400))
+
+# Speech recognition backend: google (online), sphinx or vosk (offline, vosk needs KAREN_VOSK_MODEL)
+RECOGNIZER = os.environ.get('KAREN_RECOGNIZER', 'google')
+VOSK_MODEL = os.environ.get('KAREN_VOSK_MODEL')
+# Restrict offline backends to the command vocabulary
+KEYWORD_SPOTTING = os.environ.get('KAREN_KEYWORD_SPOTTING', '0') == '1'
+
+def build_recognizer():
+    if RECOGNIZER == 'vosk':
+        return create_recognizer('vosk', model_path=VOSK_MODEL)
+    if RECOGNIZER == 'sphinx':
+        return create_recognizer('sphinx')
+    # Google backends are per session, they wrap the session's sr.Recognizer
+    return None
+
+# Offline models are loaded once and shared by all sessions
+recognizer_backend = build_recognizer()
+
+# Batch endpoints: worker threads and most items per request
+BATCH_WORKERS = int(os.environ.get('KAREN_BATCH_WORKERS', os.cpu_count() or 4))
+BATCH_LIMIT = int(os.environ.get('KAREN_BATCH_LIMIT', 500))
+# Seconds a batch request may run; items not finished by then come back with an error
+REQUEST_TIMEOUT = float(os.environ.get('KAREN_REQUEST_TIMEOUT', 120))
+# Seconds an uploaded clip may take to transcode with ffmpeg
+DECODE_TIMEOUT = float(os.environ.get('KAREN_DECODE_TIMEOUT', 30))
+
+# Serving: KAREN_SERVER=production uses waitress instead of the Flask dev server
+SERVER_MODE = os.environ.get('KAREN_SERVER', 'dev')
+HOST = os.environ.get('KAREN_HOST', '0.0.0.0')
+PORT = int(os.environ.get('KAREN_PORT', 5000))
+# Worker threads; every open status or camera stream holds one
+SERVER_THREADS = int(os.environ.get('KAREN_THREADS', 64))
+# Open status and camera streams beyond this get 503, so they cannot take every thread
+MAX_STREAMS = int(os.environ.get('KAREN_MAX_STREAMS', max(1, SERVER_THREADS // 2)))
+# Connections with no traffic for this many seconds are closed; this does not limit request time
+KEEPALIVE_TIMEOUT = int(os.environ.get('KAREN_KEEPALIVE_TIMEOUT', 75))
+# Seconds to wait for listening threads when shutting down
+SHUTDOWN_TIMEOUT = float(os.environ.get('KAREN_SHUTDOWN_TIMEOUT', 10))
+
+# Seconds between keep-alive comments on idle status streams
+STREAM_KEEPALIVE = float(os.environ.get('KAREN_STREAM_KEEPALIVE', 15))
+
+# Camera: frames go to /api/camera/stream, KAREN_CAMERA_WINDOW=1 also opens a local window
+CAMERA_WINDOW = os.environ.get('KAREN_CAMERA_WINDOW', '0') == '1'
+# Highest frame rate a stream client may request, and JPEG quality of streamed frames
+CAMERA_MAX_FPS = float(os.environ.get('KAREN_CAMERA_MAX_FPS', 15))
+CAMERA_QUALITY = int(os.environ.get('KAREN_CAMERA_QUALITY', 80))
+
+# Karen state attribute -> status key sent to clients
+STATUS_KEYS = {
+    'status': 'karen_status',
+    'listening': 'listening',
+    'last_heard': 'last_heard',
+    'partial_heard': 'partial_heard',
+    'current_animal': 'current_animal',
+    'camera_active': 'camera_active',
+    'speaking': 'speaking'
+}
+
+# Pronunciation progress database (SQLite, WAL); empty KAREN_PROGRESS_DB disables it
+PROGRESS_DB = os.environ.get('KAREN_PROGRESS_DB', os.path.join(os.path.expanduser('~'), '.local', 'share', 'karen', 'progress.db'))
+PROGRESS_BATCH = int(os.environ.get('KAREN_PROGRESS_BATCH', 200))
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get('KAREN_PROGRESS_FLUSH_INTERVAL', 0.5))
+# Progress is kept per user id when the client sends one, otherwise per session
+USER_HEADER = 'X-User-Id'
+
+# Shared by all sessions and warmed at startup
+image_cache = ImageCache(ANIMAL_IMAGES, cache_dir=IMAGE_CACHE_DIR, asset_dir=IMAGE_ASSET_DIR, offline=OFFLINE)
+# Synthesized prompt audio, shared by all sessions
+speech_cache = AudioCache(max_items=int(os.environ.get('KAREN_SPEECH_CACHE_SIZE', 256)))
+# Attempts are queued here and written in batches off the request path
+progress_store = ProgressStore(PROGRESS_DB, batch_size=PROGRESS_BATCH,
+                               flush_interval=PROGRESS_FLUSH_INTERVAL) if PROGRESS_DB else None
+
+class StatusStream:
+    """Fan-out of status deltas to subscribers, coalescing while they are busy"""
     def __init__(self):
+        self.cond = threading.Condition()
+        # token -> pending delta not yet delivered to that subscriber
+        self.subscribers = {}
+        self.closed = False
+
+    def publish(self, delta):
+        with self.cond:
+            if not self.subscribers:
+                return
+            for pending in self.subscribers.values():
+                pending.update(delta)
+            self.cond.notify_all()
+
+    def subscribe(self):
+        token = object()
+        with self.cond:
+            self.subscribers[token] = {}
+        return token
+
+    def unsubscribe(self, token):
+        with self.cond:
+            self.subscribers.pop(token, None)
+
+    def wait(self, token, timeout):
+        """Block until there is a delta for token; returns {} on timeout, None once closed"""
+        with self.cond:
+            if not self.closed and not self.subscribers.get(token):
+                self.cond.wait(timeout)
+            if self.closed or token not in self.subscribers:
+                return None
+            delta = self.subscribers[token]
+            self.subscribers[token] = {}
+            return delta
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+# Session using the local microphone, camera and TTS engine, at most one at a time
+device_lock = threading.Lock()
+device_owner = None
+
+def claim_devices(system):
+    """Give the local devices to system unless another session holds them"""
+    global device_owner
+    with device_lock:
+        if device_owner is None or device_owner is system:
+            device_owner = system
+            return True
+        return False
+
+def release_devices(system):
+    global device_owner
+    with device_lock:
+        if device_owner is system:
+            device_owner = None
+
+# Synthesis-only TTS for headless sessions, created on the first audio request
+shared_speech = None
+shared_speech_error = None
+shared_speech_lock = threading.Lock()
+
+def synthesizer(system):
+    """TTS queue rendering audio for system: its own, the device owner's or the shared one; None without TTS"""
+    global shared_speech, shared_speech_error
+    if system.karen and system.karen.speech:
+        return system.karen.speech
+    # pyttsx3 hands out one engine per process, which must not get a second worker
+    owner = device_owner
+    if owner is not None:
+        return owner.karen.speech if owner.karen else None
+    with shared_speech_lock:
+        if shared_speech is None and shared_speech_error is None:
+            try:
+                shared_speech = SpeechQueue(init_tts_engine(), audio_cache=speech_cache)
+            except Exception as e:
+                shared_speech_error = str(e)
+                print(f"[SERVER]: Speech synthesis unavailable: {e}")
+        return shared_speech
+
+def close_shared_speech():
+    global shared_speech
+    with shared_speech_lock:
+        speech, shared_speech = shared_speech, None
+    if speech:
+        speech.stop()
+
+class StreamLimiter:
+    """Count of open long-lived streams, each of which holds a server thread"""
+    def __init__(self, limit):
+        self.limit = limit
+        self.open = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            if self.open >= self.limit:
+                return False
+            self.open += 1
+            return True
+
+    def release(self):
+        with self.lock:
+            self.open -= 1
+
+class KarenSystem:
+    def __init__(self, session_id=None):
+        self.session_id = session_id
+        self.user_id = session_id
+        self.last_active = time.time()
         self.karen = None
         self.is_active = False
         self.status_message = "Ready"
         self.listening_thread = None
         self.should_listen = False
+        self.stream = StatusStream()
+
+    def in_use(self):
+        """Running, or watched by a status stream client"""
+        return self.is_active or bool(self.stream.subscribers)
+
+    def on_karen_change(self, changes, state):
+        """Karen state listener, forwards changes to status subscribers"""
+        delta = {STATUS_KEYS[field]: value for field, value in changes.items() if field in STATUS_KEYS}
+        if not delta:
+            return
+        if 'current_animal' in changes:
+            delta["image_url"] = f"/api/image/{state.current_animal}" if state.current_animal else None
+        delta["version"] = state.version
+        self.stream.publish(delta)
+
+    def on_attempt(self, attempt):
+        """Karen attempt listener, queues the attempt for the progress store"""
+        if progress_store:
+            progress_store.record(self.user_id, **attempt)
 
     def get_status(self):
         status_info = {
+            "session_id": self.session_id,
             "active": self.is_active,
             "message": self.status_message,
             "current_animal": None,
@@ -30,12 +275,21 @@ class KarenSystem:
         }
         
         if self.karen:
+            # A single snapshot read, never a mix of old and new fields
+            state = self.karen.state
             status_info.update({
-                "current_animal": getattr(self.karen, 'current_animal', None),
-                "camera_active": getattr(self.karen, 'camera_active', False),
-                "karen_status": getattr(self.karen, 'status', 'Unknown'),
-                "last_heard": getattr(self.karen, 'last_heard', ''),
-                "listening": getattr(self.karen, 'listening', False)
+                "current_animal": state.current_animal,
+                "image_url": f"/api/image/{state.current_animal}" if state.current_animal else None,
+                "camera_active": state.camera_active,
+                "karen_status": state.status,
+                "last_heard": state.last_heard,
+                "partial_heard": state.partial_heard,
+                "listening": state.listening,
+                "speaking": state.speaking,
+                "version": state.version,
+                "endpoint": self.karen.last_endpoint,
+                "speech_queue": self.karen.speech.depth() if self.karen.speech else 0,
+                "camera_stream": self.karen.frames.stats()
             })
         
         return status_info
@@ -49,12 +303,16 @@ class KarenSystem:
                 command = self.karen.listen_once()
                 if command:
                     print(f"[SERVER]: Heard voice command: {command}")
+                    # Voice-only practice counts as activity, like API requests
+                    sessions.touch(self.session_id)
                     # Process the command
-                    response = self.karen.process_command(command)
+                    response = self.karen.process_command(command, audio=self.karen.last_audio).response
                     print(f"[SERVER]: Karen responded: {response}")
-                else:
-                    time.sleep(0.5)  # Short pause if no command heard
+                elif self.karen.listen_error:
+                    # Back off on device or network errors; silence needs no pause
+                    time.sleep(1)
             except Exception as e:
+                metrics.count_error('listen', e)
                 print(f"[SERVER]: Listening error: {e}")
                 time.sleep(1)
         print("[SERVER]: Stopped continuous listening")
@@ -64,28 +322,50 @@ class KarenSystem:
             if self.is_active:
                 return {"status": "error", "message": "Already running"}
         
-            print("[SERVER]: Starting Karen with camera and voice recognition...")
-            self.karen = Karen()
-        
-            # Give Karen time to initialize
-            time.sleep(2)
+            headless = HEADLESS or not claim_devices(self)
+            if not headless:
+                # The device owner's engine renders for every session from now on
+                close_shared_speech()
+            if headless:
+                print("[SERVER]: Starting headless Karen command engine...")
+            else:
+                print("[SERVER]: Starting Karen with camera and voice recognition...")
+            started = time.perf_counter()
+            self.karen = Karen(headless=headless, image_cache=image_cache, speech_cache=speech_cache,
+                               recognizer_backend=recognizer_backend, keyword_spotting=KEYWORD_SPOTTING,
+                               display=CAMERA_WINDOW, frames=FrameBroadcaster(quality=CAMERA_QUALITY))
+            self.karen.add_state_listener(self.on_karen_change)
+            self.karen.add_attempt_listener(self.on_attempt)
+            self.karen.warm_speech_cache()
+            # Device setup: TTS engine, microphone and camera
+            metrics.observe('start', time.perf_counter() - started)
         
             # Start continuous listening in background
-            self.should_listen = True
-            self.listening_thread = threading.Thread(target=self.continuous_listening, daemon=True)
-            self.listening_thread.start()
+            if self.karen.microphone:
+                self.should_listen = True
+                self.listening_thread = threading.Thread(target=self.continuous_listening, daemon=True)
+                self.listening_thread.start()
+                self.status_message = "Active - listening for voice commands"
+            else:
+                self.status_message = "Active - accepting text commands"
+            
+            if headless:
+                message = "Karen started in headless mode"
+            else:
+                message = "Karen started with camera and voice recognition"
         
             self.is_active = True
-            self.status_message = "Active - listening for voice commands"
+            self.stream.publish(self.get_status())
         
             return {
                 "status": "success",
-                "message": "Karen started with camera and voice recognition",
+                "message": message,
                 "active": True,
                 "camera_active": getattr(self.karen, 'camera_active', False)
             }
         
         except Exception as e:
+            release_devices(self)
             error_msg = f"Start error: {str(e)}"
             print(f"[ERROR]: {error_msg}")
             return {
@@ -106,9 +386,14 @@ class KarenSystem:
             
             if self.karen:
                 self.karen.stop_interaction()
+            if self.listening_thread and self.listening_thread is not threading.current_thread():
+                # listen_once returns within its timeout once should_listen is cleared
+                self.listening_thread.join(timeout=SHUTDOWN_TIMEOUT)
+            release_devices(self)
             
             self.is_active = False
             self.status_message = "Stopped"
+            self.stream.publish({"active": False, "message": self.status_message})
             
             return {
                 "status": "success",
@@ -125,62 +410,446 @@ class KarenSystem:
                 "active": False
             }
 
-    def process_command(self, command):
+    def process_command(self, command, return_audio=False, audio=None):
+        """Run a command as a CommandResult; with return_audio Karen's speech is not played locally"""
         try:
             if not self.karen:
                 print("[SERVER]: No Karen instance available")
-                return "Karen system not initialized"
+                return CommandResult("Karen system not initialized", [], None)
         
             if not self.is_active:
                 print("[SERVER]: Karen system not active")
-                return "Karen system not active"
+                return CommandResult("Karen system not active", [], None)
         
             print(f"[SERVER]: Processing API command: {command}")
-            response = self.karen.process_command(command)
-            print(f"[SERVER]: API Response: {response}")
+            result = self.karen.process_command(command, play_speech=not return_audio, audio=audio)
+            print(f"[SERVER]: API Response: {result.response}")
         
-            return response
+            return result
         
         except Exception as e:
             error_msg = f"Command error: {str(e)}"
             print(f"[ERROR]: {error_msg}")
-            return error_msg
+            return CommandResult(error_msg, [], None)
+
+    def recognize(self, pcm_chunks=None, audio=None, sample_rate=None, run_command=True):
+        """Recognize uploaded audio and optionally run it as a command"""
+        if not self.karen or not self.is_active:
+            return {"status": "error", "message": "Karen system not active"}
+        
+        try:
+            if audio is not None:
+                text = self.karen.recognize_audio(audio)
+            else:
+                text = self.karen.recognize_chunks(pcm_chunks, sample_rate)
+        except sr.UnknownValueError:
+            return {"status": "success", "text": None, "response": None, "message": "Could not understand"}
+        except sr.RequestError as e:
+            return {"status": "error", "message": f"Recognition error: {e}"}
+        
+        result = {"status": "success", "text": text, "response": None}
+        if run_command:
+            command = self.process_command(text, audio=self.karen.last_audio)
+            result["response"] = command.response
+            result["pronunciation"] = command.score
+            result["spoken"] = command.spoken
+        return result
+
+    def synthesize_spoken(self, spoken):
+        """WAV audio, base64 encoded, for the texts a command spoke"""
+        speech = synthesizer(self)
+        if not speech:
+            return []
+        audio = []
+        for text in spoken:
+            try:
+                with metrics.time('synthesize'):
+                    wav = speech.synthesize(text)
+                audio.append({"text": text, "wav": base64.b64encode(wav).decode('ascii')})
+            except Exception as e:
+                metrics.count_error('synthesize', e)
+                print(f"[SERVER]: Synthesis error: {e}")
+        return audio
+
+class SessionLimitError(Exception):
+    """Every pooled session is in use, so no new one can be created"""
+
+
+class KarenSessionManager:
+    """Pool of per-user KarenSystem sessions with idle eviction"""
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        # Ordered by last use, least recently used first
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, session_id):
+        """Return the session for this id, creating it if needed.
+
+        A full pool makes room by evicting the least recently used session
+        that is not in use; raises SessionLimitError when every session is.
+        """
+        now = time.time()
+        with self.lock:
+            evicted = self._collect_idle(now)
+            system = self.sessions.get(session_id)
+            if system:
+                self.sessions.move_to_end(session_id)
+            else:
+                if len(self.sessions) >= self.max_sessions:
+                    unused = next((sid for sid, s in self.sessions.items() if not s.in_use()), None)
+                    if unused is None:
+                        self._close_later(evicted)
+                        raise SessionLimitError(f"All {self.max_sessions} sessions are in use, try again later")
+                    evicted.append(self.sessions.pop(unused))
+                system = KarenSystem(session_id)
+                self.sessions[session_id] = system
+            system.last_active = now
+
+        self._close_later(evicted)
+        return system
+
+    def touch(self, session_id):
+        """Mark a session as used without creating it"""
+        with self.lock:
+            system = self.sessions.get(session_id)
+            if system:
+                self.sessions.move_to_end(session_id)
+                system.last_active = time.time()
+            return system
+
+    def remove(self, session_id):
+        with self.lock:
+            system = self.sessions.pop(session_id, None)
+        if system:
+            self._close([system])
 
-# Initialize system
-karen_system = KarenSystem()
+    def evict_idle(self):
+        with self.lock:
+            evicted = self._collect_idle(time.time())
+        self._close(evicted)
+        return len(evicted)
+
+    def close_all(self):
+        """Stop every session, releasing cameras and microphones"""
+        with self.lock:
+            systems = list(self.sessions.values())
+            self.sessions.clear()
+        self._close(systems)
+        return len(systems)
+
+    def stats(self):
+        with self.lock:
+            active = sum(1 for system in self.sessions.values() if system.is_active)
+            return {
+                "sessions": len(self.sessions),
+                "active": active,
+                "max_sessions": self.max_sessions,
+                "idle_timeout": self.idle_timeout
+            }
+
+    def _collect_idle(self, now):
+        # Sessions are kept in LRU order, so the idle ones are at the head
+        evicted = []
+        for session_id, system in list(self.sessions.items()):
+            if now - system.last_active < self.idle_timeout:
+                break
+            # A client still watching the status stream keeps the session
+            if system.stream.subscribers:
+                continue
+            del self.sessions[session_id]
+            evicted.append(system)
+        return evicted
+
+    def _close_later(self, systems):
+        # Stopping joins the listening thread, so keep it off the request thread
+        if systems:
+            threading.Thread(target=self._close, args=(systems,), daemon=True).start()
+
+    def _close(self, systems):
+        # Stop evicted sessions outside the lock, stopping may be slow
+        for system in systems:
+            print(f"[SERVER]: Evicting session {system.session_id}")
+            if system.is_active:
+                system.stop_karen()
+            system.stream.close()
+
+class BatchProcessor:
+    """Runs batches of commands or clips on a shared worker pool, within timeout seconds per batch"""
+    def __init__(self, workers=BATCH_WORKERS, timeout=REQUEST_TIMEOUT):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='karen-batch')
+        self.timeout = timeout
+        # One headless engine per worker thread, reused across items
+        self.local = threading.local()
+
+    def engine(self):
+        """This thread's headless Karen, reset to a fresh session state"""
+        karen = getattr(self.local, 'karen', None)
+        if karen is None:
+            karen = Karen(headless=True, image_cache=image_cache, speech_cache=speech_cache,
+                          recognizer_backend=recognizer_backend, keyword_spotting=KEYWORD_SPOTTING)
+            self.local.karen = karen
+        karen.current_animal = None
+        karen.running = True
+        karen.status = "Ready"
+        return karen
+
+    def timed_out(self):
+        return {"error": f"Batch timed out after {self.timeout:g} s"}
+
+    def map(self, fn, items, deadline):
+        """fn over items on the pool, in order; items unfinished at the deadline give None"""
+        futures = [self.pool.submit(fn, item) for item in items]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                # Queued items are dropped; one already running finishes in the background
+                future.cancel()
+                results.append(None)
+        return results
+
+    def compact(self, result, detail=False):
+        item = {"response": result.response}
+        if result.score:
+            item["score"] = result.score["score"]
+            if detail:
+                item["phonemes"] = result.score["phonemes"]
+        return item
+
+    def run_commands(self, commands, karen_system=None, detail=False):
+        """Commands in order on a session, or independently in parallel without one"""
+        deadline = time.monotonic() + self.timeout
+        if karen_system:
+            results = []
+            for command in commands:
+                if time.monotonic() > deadline:
+                    results.append(self.timed_out())
+                    continue
+                # Batches answer in the response body, never through the local speaker
+                results.append(self.compact(karen_system.process_command(command, return_audio=True), detail))
+            return results
+        
+        def run(command):
+            karen = self.engine()
+            return self.compact(karen.process_command(command), detail)
+        return [item or self.timed_out() for item in self.map(run, commands, deadline)]
+
+    def run_clips(self, clips, karen_system=None, run_command=True, detail=False):
+        """Decode and recognize clips in parallel; commands then run in order on the session"""
+        deadline = time.monotonic() + self.timeout
+        
+        def recognize(clip):
+            data, content_type, rate, word = clip
+            item = {}
+            try:
+                audio = decode_audio(data, content_type, rate, timeout=DECODE_TIMEOUT)
+                if karen_system:
+                    karen = karen_system.karen
+                    vocabulary = karen.command_vocabulary() if karen.keyword_spotting else None
+                    with metrics.time('recognize'):
+                        item["text"] = karen.recognizer_backend.recognize(audio, vocabulary).lower().strip()
+                    return item, audio
+                
+                # Independent grading: each clip is scored against its own target word
+                karen = self.engine()
+                vocabulary = karen.command_vocabulary() if karen.keyword_spotting else None
+                with metrics.time('recognize'):
+                    item["text"] = karen.recognizer_backend.recognize(audio, vocabulary).lower().strip()
+                if run_command:
+                    karen.current_animal = word
+                    item.update(self.compact(karen.process_command(item["text"], audio=audio), detail))
+                elif word:
+                    score = karen.scorer.score(audio, word)
+                    item["score"] = score["score"] if score else None
+            except sr.UnknownValueError as e:
+                metrics.count_error('batch', e)
+                item["text"] = None
+            except Exception as e:
+                # One bad clip fails only its own item
+                metrics.count_error('batch', e)
+                item["error"] = str(e)
+            return item, None
+        
+        recognized = [done or (self.timed_out(), None) for done in self.map(recognize, clips, deadline)]
+        results = [item for item, _ in recognized]
+        
+        if karen_system and run_command:
+            for item, audio in recognized:
+                if item.get("text") and time.monotonic() > deadline:
+                    item.update(self.timed_out())
+                elif item.get("text"):
+                    result = karen_system.process_command(item["text"], return_audio=True, audio=audio)
+                    item.update(self.compact(result, detail))
+        return results
+
+# Initialize session pool
+sessions = KarenSessionManager()
+open_streams = StreamLimiter(MAX_STREAMS)
+batches = BatchProcessor()
+
+def requested_session_id():
+    """Session id from header, cookie or query (EventSource), None if missing or malformed"""
+    session_id = (request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+                  or request.args.get('session_id'))
+    return session_id if session_id and SESSION_ID_PATTERN.match(session_id) else None
+
+def current_session(create=True):
+    """Resolve the caller's session; without create, None unless it already exists"""
+    session_id = requested_session_id()
+    if create:
+        session_id = session_id or uuid.uuid4().hex
+        system = sessions.get(session_id)
+    else:
+        system = sessions.touch(session_id) if session_id else None
+        if not system:
+            return None
+    g.session_id = session_id
+    user_id = request.headers.get(USER_HEADER)
+    if user_id and SESSION_ID_PATTERN.match(user_id):
+        system.user_id = user_id
+    return system
+
+@app.after_request
+def attach_session(response):
+    session_id = g.get('session_id')
+    if session_id:
+        response.headers[SESSION_HEADER] = session_id
+        if request.cookies.get(SESSION_COOKIE) != session_id:
+            response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite='Lax')
+    return response
+
+@app.errorhandler(SessionLimitError)
+def session_limit(e):
+    return jsonify({'status': 'error', 'message': str(e)}), 503
 
 @app.route('/api/status', methods=['GET'])
 def status():
+    # Polling must not create sessions, an unknown caller gets the not-started status
+    karen_system = current_session(create=False) or KarenSystem()
     return jsonify(karen_system.get_status())
 
+def limited_stream(view):
+    """Refuse a stream with 503 when MAX_STREAMS are open; the slot is freed when the client leaves"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not open_streams.acquire():
+            return jsonify({'status': 'error', 'message': 'Too many open streams, try again later'}), 503
+        try:
+            response = view(*args, **kwargs)
+        except Exception:
+            open_streams.release()
+            raise
+        if isinstance(response, Response) and response.is_streamed:
+            response.call_on_close(open_streams.release)
+        else:
+            open_streams.release()
+        return response
+    return wrapper
+
+@app.route('/api/status/stream', methods=['GET'])
+@limited_stream
+def status_stream():
+    """Server-Sent Events: full status first, then only changed fields"""
+    karen_system = current_session()
+    session_id = karen_system.session_id
+    stream = karen_system.stream
+    token = stream.subscribe()
+    initial = karen_system.get_status()
+    
+    def events():
+        try:
+            yield f"data: {json.dumps(initial)}\n\n"
+            while True:
+                delta = stream.wait(token, STREAM_KEEPALIVE)
+                if delta is None:
+                    break
+                if delta:
+                    yield f"data: {json.dumps(delta)}\n\n"
+                else:
+                    # Keep proxies from closing the connection and the session from idling out
+                    sessions.touch(session_id)
+                    yield ": keep-alive\n\n"
+        finally:
+            stream.unsubscribe(token)
+    
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/camera/stream', methods=['GET'])
+@limited_stream
+def camera_stream():
+    """MJPEG stream of the annotated camera frames, ?fps= caps this client's frame rate"""
+    karen_system = current_session(create=False)
+    karen = karen_system.karen if karen_system else None
+    if not karen_system or not karen_system.is_active or not karen or not karen.camera_active:
+        return jsonify({"status": "error", "message": "Camera not active"}), 409
+    
+    try:
+        fps = min(float(request.args.get('fps', CAMERA_MAX_FPS)), CAMERA_MAX_FPS)
+    except ValueError:
+        fps = CAMERA_MAX_FPS
+    if not fps > 0:
+        fps = CAMERA_MAX_FPS
+    
+    return Response(karen.frames.stream(max_fps=fps, timeout=STREAM_KEEPALIVE),
+                    mimetype=f'multipart/x-mixed-replace; boundary={BOUNDARY}', headers={
+        'Cache-Control': 'no-cache, no-store',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/start', methods=['POST'])
 def start():
-    return jsonify(karen_system.start_karen())
+    return jsonify(current_session().start_karen())
 
 @app.route('/api/stop', methods=['POST'])
 def stop():
+    karen_system = current_session(create=False)
+    if not karen_system:
+        return jsonify({"status": "error", "message": "Not running"})
     return jsonify(karen_system.stop_karen())
 
+@app.route('/api/sessions', methods=['GET'])
+def session_stats():
+    return jsonify(sessions.stats())
+
 @app.route('/api/command', methods=['POST'])
 def command():
+    karen_system = current_session()
     try:
         data = request.get_json()
         command_text = data.get('command', '') if data else ''
+        return_audio = bool(data.get('audio', False)) if data else False
         
         if not command_text:
             return jsonify({
                 'status': 'error',
                 'message': 'No command provided'
             }), 400
+        if return_audio and not synthesizer(karen_system):
+            return jsonify({
+                'status': 'error',
+                'message': 'Speech synthesis unavailable on this server'
+            }), 503
         
-        response = karen_system.process_command(command_text)
+        command_result = karen_system.process_command(command_text, return_audio=return_audio)
         
-        return jsonify({
+        result = {
             'status': 'success',
-            'response': response,
+            'response': command_result.response,
             'command': command_text,
+            'spoken': command_result.spoken,
+            'pronunciation': command_result.score,
             'karen_status': karen_system.get_status()
-        })
+        }
+        if return_audio:
+            result['audio'] = karen_system.synthesize_spoken(command_result.spoken)
+        
+        return jsonify(result)
         
     except Exception as e:
         return jsonify({
@@ -188,6 +857,203 @@ def command():
             'message': str(e)
         }), 500
 
+@app.route('/api/image/<animal>', methods=['GET'])
+def animal_image(animal):
+    if animal not in ANIMAL_IMAGES:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown animal: {animal}'
+        }), 404
+    
+    size = request.args.get('size', 'medium')
+    fmt = request.args.get('format')
+    if not fmt:
+        fmt = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+    
+    if size not in VARIANT_SIZES or fmt not in VARIANT_FORMATS:
+        return jsonify({
+            'status': 'error',
+            'message': f"Size must be one of {', '.join(VARIANT_SIZES)} and format one of {', '.join(VARIANT_FORMATS)}"
+        }), 400
+    
+    try:
+        data, etag, mimetype = image_cache.get_variant(animal, size, fmt)
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Image unavailable: {e}'
+        }), 503
+    
+    response = Response(data, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={IMAGE_MAX_AGE}'
+    response.headers['Vary'] = 'Accept'
+    return response.make_conditional(request)
+
+@app.route('/api/recognize', methods=['POST'])
+def recognize():
+    """Recognize browser-captured audio: WAV, WebM/Ogg, or raw 16-bit PCM (streamable)"""
+    karen_system = current_session()
+    try:
+        run_command = request.args.get('process', '1') != '0'
+        rate = request.args.get('rate', type=int)
+        
+        upload = request.files.get('audio')
+        if upload:
+            # multipart/form-data from FormData
+            audio = decode_audio(upload.read(), upload.mimetype, rate, timeout=DECODE_TIMEOUT)
+            result = karen_system.recognize(audio=audio, run_command=run_command)
+        elif is_pcm(request.content_type):
+            # Raw PCM is recognized while the (possibly chunked) body is still arriving
+            chunks = iter_pcm_chunks(request.stream)
+            result = karen_system.recognize(pcm_chunks=chunks, sample_rate=rate or content_rate(request.content_type),
+                                            run_command=run_command)
+        else:
+            audio = decode_audio(request.get_data(), request.content_type, rate, timeout=DECODE_TIMEOUT)
+            result = karen_system.recognize(audio=audio, run_command=run_command)
+        
+        if result["status"] == "error":
+            return jsonify(result), 502 if karen_system.is_active else 409
+        result['karen_status'] = karen_system.get_status()
+        return jsonify(result)
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+def batch_session(isolated):
+    """The caller's active session, or None for isolated batches"""
+    if isolated:
+        return None
+    karen_system = current_session()
+    if not karen_system.karen or not karen_system.is_active:
+        raise RuntimeError("Karen system not active")
+    return karen_system
+
+@app.route('/api/command/batch', methods=['POST'])
+def command_batch():
+    """Many text commands at once; isolated=true runs each on a fresh engine in parallel"""
+    try:
+        data = request.get_json(silent=True) or {}
+        commands = data.get('commands', []) if isinstance(data, dict) else None
+        if not isinstance(commands, list) or not all(isinstance(command, str) for command in commands):
+            return jsonify({'status': 'error', 'message': 'commands must be a list of strings'}), 400
+        commands = [command for command in commands if command]
+        if not commands:
+            return jsonify({'status': 'error', 'message': 'No commands provided'}), 400
+        if len(commands) > BATCH_LIMIT:
+            return jsonify({'status': 'error', 'message': f'At most {BATCH_LIMIT} commands per batch'}), 413
+        
+        karen_system = batch_session(bool(data.get('isolated', False)))
+        results = batches.run_commands(commands, karen_system, detail=bool(data.get('detail', False)))
+        return jsonify({'status': 'success', 'count': len(results), 'results': results})
+        
+    except SessionLimitError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
+    except RuntimeError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+def parse_clip(index, clip):
+    """(audio bytes, type, rate, word) of a JSON clip; ValueError names the first bad field"""
+    audio, content_type = clip.get('audio', ''), clip.get('type', 'audio/wav')
+    rate, word = clip.get('rate'), clip.get('word')
+    if not isinstance(audio, str):
+        raise ValueError(f"clip {index}: audio must be a base64 string")
+    if not isinstance(content_type, str):
+        raise ValueError(f"clip {index}: type must be a string")
+    if rate is not None and (isinstance(rate, bool) or not isinstance(rate, int) or rate <= 0):
+        raise ValueError(f"clip {index}: rate must be a positive integer")
+    if word is not None and not isinstance(word, str):
+        raise ValueError(f"clip {index}: word must be a string")
+    return base64.b64decode(audio), content_type, rate, word
+
+@app.route('/api/recognize/batch', methods=['POST'])
+def recognize_batch():
+    """Many clips at once, as multipart 'audio' files or JSON base64 clips"""
+    try:
+        if request.files:
+            options = request.form
+            words = request.form.getlist('word')
+            clips = [(f.read(), f.mimetype, request.args.get('rate', type=int), words[i] if i < len(words) else None)
+                     for i, f in enumerate(request.files.getlist('audio'))]
+        else:
+            options = request.get_json(silent=True) or {}
+            items = options.get('clips', []) if isinstance(options, dict) else None
+            if not isinstance(items, list) or not all(isinstance(clip, dict) for clip in items):
+                return jsonify({'status': 'error', 'message': 'clips must be a list of objects'}), 400
+            clips = [parse_clip(i, clip) for i, clip in enumerate(items)]
+        
+        if not clips:
+            return jsonify({'status': 'error', 'message': 'No audio clips provided'}), 400
+        if len(clips) > BATCH_LIMIT:
+            return jsonify({'status': 'error', 'message': f'At most {BATCH_LIMIT} clips per batch'}), 413
+        
+        def flag(name, default):
+            value = options.get(name, default)
+            return value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'yes')
+        
+        karen_system = batch_session(flag('isolated', False))
+        results = batches.run_clips(clips, karen_system, run_command=flag('process', True),
+                                    detail=flag('detail', False))
+        return jsonify({'status': 'success', 'count': len(results), 'results': results})
+        
+    except SessionLimitError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
+    except RuntimeError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'Invalid clip: {e}'}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Per-stage latency histograms and error counters, Prometheus text format"""
+    stats = sessions.stats()
+    text = metrics.render(gauges={
+        'sessions': ("Open sessions.", stats["sessions"]),
+        'sessions_active': ("Sessions with Karen started.", stats["active"]),
+        'streams_open': ("Open status and camera streams.", open_streams.open),
+        'progress_pending': ("Attempts queued for the progress store.",
+                             progress_store.pending.qsize() if progress_store else 0)
+    })
+    return Response(text, mimetype='text/plain; version=0.0.4')
+
+def progress_user():
+    """User whose progress is requested: X-User-Id, else the caller's session"""
+    user_id = request.headers.get(USER_HEADER) or request.args.get('user_id')
+    if user_id and SESSION_ID_PATTERN.match(user_id):
+        return user_id
+    # Reading progress never creates a session; user ids default to the session id
+    karen_system = current_session(create=False)
+    return karen_system.user_id if karen_system else requested_session_id()
+
+@app.route('/api/progress', methods=['GET'])
+def progress_summary():
+    """Totals, per-word averages, daily activity (?days=) and streak"""
+    if not progress_store:
+        return jsonify({"status": "error", "message": "Progress store disabled"}), 404
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    return jsonify(progress_store.summary(progress_user(), days=days))
+
+@app.route('/api/progress/attempts', methods=['GET'])
+def progress_attempts():
+    """Most recent attempts, optionally for one ?word="""
+    if not progress_store:
+        return jsonify({"status": "error", "message": "Progress store disabled"}), 404
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    word = request.args.get('word')
+    return jsonify({"attempts": progress_store.recent(progress_user(), word=word, limit=limit)})
+
 @app.route('/api/test', methods=['GET'])
 def test():
     return jsonify({
@@ -196,8 +1062,48 @@ def test():
         "time": time.time()
     })
 
+def shutdown():
+    """Stop all sessions and worker pools; safe to call more than once"""
+    print("[SERVER]: Shutting down...")
+    closed = sessions.close_all()
+    close_shared_speech()
+    batches.pool.shutdown(wait=False, cancel_futures=True)
+    if progress_store:
+        # Commit attempts still queued
+        progress_store.close()
+    print(f"[SERVER]: Closed {closed} sessions")
+
+def serve_production():
+    """Multi-threaded waitress server with graceful shutdown on SIGINT/SIGTERM"""
+    try:
+        from waitress import serve
+    except ImportError:
+        raise SystemExit("[SERVER]: Production mode needs waitress (pip install waitress)")
+    
+    def on_signal(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, on_signal)
+    
+    print(f"[SERVER]: Starting production server on {HOST}:{PORT} with {SERVER_THREADS} threads...")
+    try:
+        serve(app, host=HOST, port=PORT, threads=SERVER_THREADS, channel_timeout=KEEPALIVE_TIMEOUT,
+              connection_limit=max(100, SERVER_THREADS * 4), ident='karen')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown()
+
 if __name__ == '__main__':
-    print("[SERVER]: Starting Flask server on port 5000...")
-    print("[SERVER]: Karen will listen for voice commands when started")
-    print("[SERVER]: Say 'show me rabbit' or similar commands")
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Camera, TTS, plotting and NumPy load on first use; see python -m speechRecognition.importtime
+    print(f"[SERVER]: Heavy modules loaded at startup: {', '.join(loaded_heavy_modules()) or 'none'}")
+    image_cache.prefetch()
+    if SERVER_MODE == 'production':
+        serve_production()
+    else:
+        print(f"[SERVER]: Starting Flask server on port {PORT}...")
+        if HEADLESS:
+            print("[SERVER]: Headless: send commands to /api/command (KAREN_HEADLESS=0 uses mic and camera)")
+        else:
+            print("[SERVER]: Karen will listen for voice commands when started")
+            print("[SERVER]: Say 'show me rabbit' or similar commands")
+        app.run(host=HOST, port=PORT, debug=True)
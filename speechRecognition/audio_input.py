@@ -0,0 +1,81 @@
+import subprocess
+from io import BytesIO
+
+import speech_recognition as sr
+
+
+DEFAULT_SAMPLE_RATE = 16000
+# Longest an ffmpeg transcode may take, in seconds
+DECODE_TIMEOUT = 30
+
+WAV_TYPES = ('audio/wav', 'audio/wave', 'audio/x-wav', 'audio/vnd.wave')
+PCM_TYPES = ('audio/l16', 'audio/pcm', 'audio/x-pcm', 'application/octet-stream')
+# Compressed browser formats, decoded by ffmpeg over pipes
+FFMPEG_TYPES = ('audio/webm', 'audio/ogg', 'audio/mp4', 'audio/mpeg', 'video/webm')
+
+
+def media_type(content_type):
+    """Lower-cased media type without parameters"""
+    return (content_type or '').split(';')[0].strip().lower()
+
+
+def content_rate(content_type, default=DEFAULT_SAMPLE_RATE):
+    """Sample rate from a 'audio/l16; rate=16000' style content type"""
+    for param in (content_type or '').split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'rate' and value.strip().isdigit():
+            return int(value.strip())
+    return default
+
+
+def is_pcm(content_type):
+    return media_type(content_type) in PCM_TYPES
+
+
+def decode_audio(data, content_type, sample_rate=None, timeout=DECODE_TIMEOUT):
+    """Decode an uploaded clip into sr.AudioData, entirely in memory"""
+    kind = media_type(content_type)
+
+    if kind in PCM_TYPES:
+        return sr.AudioData(data, sample_rate or content_rate(content_type), 2)
+
+    if kind in WAV_TYPES or data[:4] == b'RIFF':
+        with sr.AudioFile(BytesIO(data)) as source:
+            return sr.Recognizer().record(source)
+
+    if kind in FFMPEG_TYPES:
+        rate = sample_rate or DEFAULT_SAMPLE_RATE
+        return sr.AudioData(ffmpeg_to_pcm(data, rate, timeout), rate, 2)
+
+    raise ValueError(f"Unsupported audio type: {content_type or 'unknown'}")
+
+
+def ffmpeg_to_pcm(data, sample_rate=DEFAULT_SAMPLE_RATE, timeout=DECODE_TIMEOUT):
+    """Transcode any ffmpeg-readable clip to mono 16-bit PCM via stdin/stdout; ValueError past timeout"""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-loglevel', 'error', '-i', 'pipe:0',
+             '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), 'pipe:1'],
+            input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout, check=True
+        )
+    except FileNotFoundError:
+        raise ValueError("Compressed audio needs ffmpeg on the server; send WAV or PCM instead")
+    except subprocess.TimeoutExpired:
+        raise ValueError(f"Decoding took longer than {timeout:g} s")
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Could not decode audio: {e.stderr.decode(errors='ignore').strip()}")
+    return result.stdout
+
+
+def iter_pcm_chunks(stream, chunk_bytes=6400):
+    """Read an upload body incrementally in whole 16-bit samples"""
+    remainder = b''
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        data = remainder + data
+        usable = len(data) - len(data) % 2
+        remainder = data[usable:]
+        if usable:
+            yield data[:usable]
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+
+# One encoded camera frame; seq increases by one per published frame
+EncodedFrame = namedtuple('EncodedFrame', ['seq', 'jpeg', 'timestamp'])
+
+BOUNDARY = 'frame'
+
+
+class FrameBroadcaster:
+    """Latest-frame fan-out of camera frames to streaming clients.
+
+    The capture thread publishes every annotated frame; it is JPEG encoded
+    once, and only while someone is watching, into a small ring of recent
+    frames. Clients always jump to the newest frame, so a slow client skips
+    frames instead of building up a backlog or slowing the camera down.
+    """
+
+    def __init__(self, quality=80, ring_size=2):
+        self.quality = quality
+        self.frames = deque(maxlen=ring_size)
+        self.cond = threading.Condition()
+        self.subscribers = 0
+        self.closed = False
+        self.encoded = 0
+
+    def publish(self, frame):
+        """Encode and store a BGR frame; skipped when nobody is subscribed"""
+        if not self.subscribers or self.closed:
+            return None
+        # Only the capture thread gets here, after cv2 is already loaded
+        import cv2
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return None
+        with self.cond:
+            seq = self.frames[-1].seq + 1 if self.frames else 1
+            encoded = EncodedFrame(seq, jpeg.tobytes(), time.time())
+            self.frames.append(encoded)
+            self.encoded += 1
+            self.cond.notify_all()
+        return encoded
+
+    def latest(self):
+        with self.cond:
+            return self.frames[-1] if self.frames else None
+
+    def wait(self, after_seq, timeout):
+        """Newest frame with seq > after_seq; None on timeout or once closed"""
+        with self.cond:
+            deadline = time.monotonic() + timeout
+            while not self.closed:
+                if self.frames and self.frames[-1].seq > after_seq:
+                    return self.frames[-1]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.cond.wait(remaining)
+            return None
+
+    def stream(self, max_fps=15, timeout=10):
+        """multipart/x-mixed-replace body: newest frame, at most max_fps per second"""
+        interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0
+        with self.cond:
+            self.subscribers += 1
+        try:
+            seq = 0
+            next_at = 0.0
+            while not self.closed:
+                # Rate cap: sleep first, then take whatever is newest
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                frame = self.wait(seq, timeout)
+                if frame is None:
+                    if self.closed:
+                        break
+                    continue
+                seq = frame.seq
+                next_at = time.monotonic() + interval
+                yield (f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                       f"Content-Length: {len(frame.jpeg)}\r\n\r\n").encode('ascii') + frame.jpeg + b"\r\n"
+        finally:
+            with self.cond:
+                self.subscribers -= 1
+
+    def stats(self):
+        with self.cond:
+            latest = self.frames[-1] if self.frames else None
+            return {
+                "subscribers": self.subscribers,
+                "frames_encoded": self.encoded,
+                "latest_seq": latest.seq if latest else None
+            }
+
+    def close(self):
+        """Wake and end every stream"""
+        with self.cond:
+            self.closed = True
+            self.frames.clear()
+            self.cond.notify_all()
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Pre-encoded variants served to clients: longest side in pixels
+VARIANT_SIZES = {'small': 200, 'medium': 400, 'large': 800}
+VARIANT_FORMATS = {
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4})
+}
+
+
+class ImageCache:
+    """Animal image cache: in-memory LRU over an on-disk store and local assets"""
+
+    def __init__(self, sources, cache_dir=None, asset_dir=None, offline=False,
+                 max_items=32, max_size=(800, 800), timeout=10):
+        self.sources = dict(sources)
+        self.cache_dir = cache_dir
+        self.asset_dir = asset_dir
+        self.offline = offline
+        self.max_items = max_items
+        self.max_size = max_size
+        self.timeout = timeout
+
+        # name -> decoded, resized PIL image, least recently used first
+        self.images = OrderedDict()
+        self.lock = threading.Lock()
+        # One lock per name so concurrent misses only download once
+        self.fetch_locks = {}
+        # (name, size, format) -> (bytes, etag, mimetype), encoded once
+        self.variants = {}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, name):
+        """Return the decoded image for name, loading it on a miss"""
+        with self.lock:
+            img = self.images.get(name)
+            if img is not None:
+                self.images.move_to_end(name)
+                return img
+            fetch_lock = self.fetch_locks.setdefault(name, threading.Lock())
+
+        with fetch_lock:
+            with self.lock:
+                img = self.images.get(name)
+            if img is not None:
+                return img
+
+            img = self._decode(self.get_bytes(name))
+            with self.lock:
+                self.images[name] = img
+                while len(self.images) > self.max_items:
+                    self.images.popitem(last=False)
+            return img
+
+    def get_bytes(self, name):
+        """Return the original encoded bytes for name"""
+        data = self._read_local(name)
+        if data is not None:
+            return data
+
+        if self.offline:
+            raise KeyError(f"No local image for '{name}' in offline mode")
+        if name not in self.sources:
+            raise KeyError(f"Unknown image '{name}'")
+
+        # requests and PIL load on the first download/decode, not at import
+        import requests
+        response = requests.get(self.sources[name], timeout=self.timeout)
+        response.raise_for_status()
+        data = response.content
+
+        if self.cache_dir:
+            self._write_cache(name, data)
+        return data
+
+    def get_variant(self, name, size='medium', fmt='jpeg'):
+        """Return (bytes, etag, mimetype) for a resized, encoded variant"""
+        key = (name, size, fmt)
+        with self.lock:
+            variant = self.variants.get(key)
+        if variant is not None:
+            return variant
+
+        pil_format, mimetype, options = VARIANT_FORMATS[fmt]
+        img = self.get(name).copy()
+        img.thumbnail((VARIANT_SIZES[size], VARIANT_SIZES[size]))
+
+        buffer = BytesIO()
+        img.save(buffer, pil_format, **options)
+        data = buffer.getvalue()
+        etag = hashlib.sha1(data).hexdigest()[:16]
+
+        variant = (data, etag, mimetype)
+        with self.lock:
+            self.variants[key] = variant
+        return variant
+
+    def build_variants(self, name):
+        for size in VARIANT_SIZES:
+            for fmt in VARIANT_FORMATS:
+                self.get_variant(name, size, fmt)
+
+    def prefetch(self, names=None, background=True, variants=True):
+        """Warm the cache for names (default: all sources)"""
+        names = list(names or self.sources.keys())
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                    if variants:
+                        self.build_variants(name)
+                except Exception as e:
+                    print(f"[IMAGES]: Prefetch failed for {name}: {e}")
+            print(f"[IMAGES]: Prefetched {len(self.images)} images")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.variants.clear()
+
+    def _decode(self, data):
+        from PIL import Image
+        img = Image.open(BytesIO(data))
+        img = img.convert('RGB')
+        img.thumbnail(self.max_size)
+        return img
+
+    def _local_paths(self, name):
+        for directory in (self.asset_dir, self.cache_dir):
+            if not directory:
+                continue
+            for ext in IMAGE_EXTENSIONS:
+                yield os.path.join(directory, name + ext)
+
+    def _read_local(self, name):
+        for path in self._local_paths(name):
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+        return None
+
+    def _write_cache(self, name, data):
+        # Write then rename so readers never see a partial file
+        path = os.path.join(self.cache_dir, name + '.jpg')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[IMAGES]: Could not cache {name}: {e}")
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+
+# Dependencies that should only load when their feature is used
+HEAVY_MODULES = ('numpy', 'cv2', 'PIL', 'requests', 'pyttsx3', 'matplotlib')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_heavy_modules():
+    """Heavy dependencies already imported in this process"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def measure(module='server'):
+    """Import module in a fresh interpreter with -X importtime.
+
+    Returns (total_ms, [(package, cumulative_ms, depth)]) for everything the
+    module pulled in; depth 1 entries are its direct imports.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"import {module} failed")
+
+    # Entries print as each import finishes, so a module's imports precede it
+    timings = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package (indented by nesting)
+        if not line.startswith('import time:') or line.count('|') != 2:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append((name.strip(), int(cumulative) / 1000.0, depth))
+
+    # Keep only the subtree of the requested module, not interpreter startup
+    end = next((i for i, (name, _, depth) in enumerate(timings) if depth == 0 and name == module), None)
+    if end is None:
+        return 0.0, []
+    start = end
+    while start > 0 and timings[start - 1][2] > 0:
+        start -= 1
+    return timings[end][1], timings[start:end]
+
+
+def report(module='server', top=15):
+    total, timings = measure(module)
+    lines = [f"import {module}: {total:.1f} ms"]
+    direct = [(name, ms) for name, ms, depth in timings if depth == 1]
+    for name, ms in sorted(direct, key=lambda item: -item[1])[:top]:
+        lines.append(f"  {ms:8.1f} ms  {name}")
+    imported = {name for name, _, _ in timings}
+    heavy = [name for name in HEAVY_MODULES if name in imported]
+    lines.append(f"heavy modules imported: {', '.join(heavy) if heavy else 'none'}")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    # python -m speechRecognition.importtime [module]
+    print(report(sys.argv[1] if len(sys.argv) > 1 else 'server'))
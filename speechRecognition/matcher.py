@@ -0,0 +1,66 @@
+import re
+from collections import namedtuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# A phrase found in a command; position is the index of its first token
+Match = namedtuple('Match', ['intent', 'value', 'phrase', 'position', 'priority'])
+
+_Entry = namedtuple('_Entry', ['tokens', 'intent', 'value', 'priority'])
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class CommandMatcher:
+    """Whole-word phrase matcher compiled once from the command vocabulary.
+
+    Phrases are indexed by their first token, so matching a command costs one
+    dict lookup per spoken token no matter how many phrases are registered.
+    """
+
+    def __init__(self):
+        # first token -> entries starting with it, longest phrase first
+        self.index = {}
+        self.size = 0
+
+    def add(self, phrase, intent, value=None, priority=0):
+        """Register phrase for intent; lower priority numbers win in best()"""
+        tokens = tuple(tokenize(phrase))
+        if not tokens:
+            return
+        entries = self.index.setdefault(tokens[0], [])
+        entries.append(_Entry(tokens, intent, value if value is not None else phrase, priority))
+        entries.sort(key=lambda entry: -len(entry.tokens))
+        self.size += 1
+
+    def match(self, text):
+        """Return {intent: Match} with the first occurrence of each intent"""
+        tokens = tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            step = 1
+            for entry in self.index.get(tokens[i], ()):
+                length = len(entry.tokens)
+                if tuple(tokens[i:i + length]) != entry.tokens:
+                    continue
+                if entry.intent not in found:
+                    found[entry.intent] = Match(entry.intent, entry.value, ' '.join(entry.tokens), i, entry.priority)
+                # Longest phrase wins, skip past it
+                step = length
+                break
+            i += step
+        return found
+
+    def best(self, text):
+        """Highest priority match, earliest in the command on ties"""
+        return self.pick(self.match(text))
+
+    def pick(self, matches):
+        """best() over an existing match() result"""
+        if not matches:
+            return None
+        return min(matches.values(), key=lambda m: (m.priority, m.position))
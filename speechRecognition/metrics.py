@@ -0,0 +1,117 @@
+import threading
+import time
+from bisect import bisect_left
+
+
+# Histogram bucket upper bounds in seconds, shared by every stage
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; counts are per bucket, not cumulative"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Last slot is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class StageTimer:
+    """Context manager that records its block's duration, also when it raises"""
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class Metrics:
+    """Per-stage latency histograms and error counters in Prometheus text format.
+
+    Recording costs one lock and a bisect, so it is safe on the hot path.
+    """
+
+    def __init__(self, prefix='karen', buckets=LATENCY_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # stage -> Histogram
+        self.stages = {}
+        # (stage, error type) -> count
+        self.errors = {}
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def time(self, stage):
+        """with metrics.time('recognize'): ..."""
+        return StageTimer(self, stage)
+
+    def count_error(self, stage, error):
+        """Count an error by stage and exception type (or a type name)"""
+        kind = error if isinstance(error, str) else type(error).__name__
+        with self.lock:
+            key = (stage, kind)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.errors.clear()
+
+    def render(self, gauges=None):
+        """Prometheus text exposition; gauges is {name: (help, value)} added as-is"""
+        with self.lock:
+            stages = {stage: (list(h.counts), h.sum, h.count) for stage, h in self.stages.items()}
+            errors = dict(self.errors)
+
+        name = f"{self.prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each stage of handling a command.",
+            f"# TYPE {name} histogram"
+        ]
+        for stage in sorted(stages):
+            counts, total, count = stages[stage]
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (None,), counts):
+                cumulative += bucket
+                le = '+Inf' if bound is None else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+
+        name = f"{self.prefix}_errors_total"
+        lines.append(f"# HELP {name} Errors by stage and exception type.")
+        lines.append(f"# TYPE {name} counter")
+        for (stage, kind), count in sorted(errors.items()):
+            lines.append(f'{name}{{stage="{stage}",type="{kind}"}} {count}')
+
+        for gauge, (help_text, value) in (gauges or {}).items():
+            name = f"{self.prefix}_{gauge}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by every Karen and session
+metrics = Metrics()
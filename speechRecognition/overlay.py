@@ -0,0 +1,123 @@
+import cv2
+import numpy as np
+
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Box corners (x1, y1, x2, y2) and how much of the camera image shows through
+STATUS_BOX = (10, 10, 780, 150)
+ANIMAL_BOX = (10, 160, 400, 220)
+BOX_OPACITY = 0.7
+ANIMAL_BOX_COLOR = (0, 100, 0)
+
+
+class TextLayer:
+    """Text pre-rendered once into an image plus coverage, blended onto frames"""
+
+    def __init__(self, width, height):
+        # Text colour already scaled by its coverage, as putText leaves it on black
+        self.image = np.zeros((height, width, 3), dtype=np.uint8)
+        # How much of the frame shows through each pixel, 255 where there is no text
+        self.clear = np.full((height, width, 3), 255, dtype=np.uint8)
+        self.coverage = np.zeros((height, width), dtype=np.uint8)
+
+    def draw(self, lines):
+        """lines: (text, (x, y), scale, color, thickness) relative to the layer"""
+        self.image[:] = 0
+        self.coverage[:] = 0
+        for text, origin, scale, color, thickness in lines:
+            cv2.putText(self.image, text, origin, FONT, scale, color, thickness)
+            # Same raster in one channel, so anti-aliased edges keep their partial coverage
+            cv2.putText(self.coverage, text, origin, FONT, scale, 255, thickness)
+        cv2.cvtColor(255 - self.coverage, cv2.COLOR_GRAY2BGR, dst=self.clear)
+
+    def paste(self, roi):
+        # roi = roi * (1 - coverage) + text colour * coverage
+        height, width = roi.shape[:2]
+        cv2.multiply(roi, self.clear[:height, :width], dst=roi, scale=1.0 / 255)
+        cv2.add(roi, self.image[:height, :width], dst=roi)
+
+
+class OverlayRenderer:
+    """Draws Karen's status overlay onto camera frames.
+
+    Text is rasterized only when the state version or frame size changes; per
+    frame only the box regions are darkened in place and the cached text is
+    copied in, reusing one mirrored frame buffer.
+    """
+
+    def __init__(self, animals):
+        self.animals = list(animals)
+        self.buffer = None
+        self.version = None
+        self.status_layer = TextLayer(STATUS_BOX[2] - STATUS_BOX[0], STATUS_BOX[3] - STATUS_BOX[1])
+        self.animal_layer = TextLayer(ANIMAL_BOX[2] - ANIMAL_BOX[0], ANIMAL_BOX[3] - ANIMAL_BOX[1])
+        self.instruction_layer = None
+        # Box tint added after darkening: opacity * color
+        self.animal_tint = np.empty((ANIMAL_BOX[3] - ANIMAL_BOX[1], ANIMAL_BOX[2] - ANIMAL_BOX[0], 3), dtype=np.uint8)
+        self.animal_tint[:] = [round(c * BOX_OPACITY) for c in ANIMAL_BOX_COLOR]
+
+    def render(self, frame, state):
+        """Return the mirrored, annotated frame (a reused buffer)"""
+        if self.buffer is None or self.buffer.shape != frame.shape:
+            self.buffer = np.empty_like(frame)
+            self.build_static(frame.shape)
+        cv2.flip(frame, 1, dst=self.buffer)
+        out = self.buffer
+
+        if state.version != self.version:
+            self.build_dynamic(state)
+            self.version = state.version
+
+        self.blend_box(out, STATUS_BOX)
+        self.status_layer.paste(self.region(out, STATUS_BOX))
+
+        if state.current_animal:
+            self.blend_box(out, ANIMAL_BOX, self.animal_tint)
+            self.animal_layer.paste(self.region(out, ANIMAL_BOX))
+
+        height = out.shape[0]
+        self.instruction_layer.paste(out[height - 100:height, 0:self.instruction_layer.image.shape[1]])
+        return out
+
+    def region(self, frame, box):
+        x1, y1, x2, y2 = box
+        return frame[y1:y2, x1:x2]
+
+    def blend_box(self, frame, box, tint=None):
+        # In place on the box only: box = (1 - opacity) * frame + opacity * color
+        roi = self.region(frame, box)
+        if tint is None:
+            cv2.convertScaleAbs(roi, dst=roi, alpha=1.0 - BOX_OPACITY)
+        else:
+            height, width = roi.shape[:2]
+            cv2.scaleAdd(roi, 1.0 - BOX_OPACITY, tint[:height, :width], dst=roi)
+
+    def build_static(self, shape):
+        height, width = shape[:2]
+        self.instruction_layer = TextLayer(min(width, 780), 100)
+        self.instruction_layer.draw([
+            ("Say: 'show me [animal]'", (20, 20), 0.5, (200, 200, 200), 1),
+            (f"Animals: {', '.join(self.animals)}", (20, 45), 0.5, (200, 200, 200), 1),
+            ("Press 'q' to quit", (20, 70), 0.5, (200, 200, 200), 1)
+        ])
+        self.version = None
+
+    def build_dynamic(self, state):
+        # Layer coordinates are frame coordinates minus the box origin
+        x, y = STATUS_BOX[0], STATUS_BOX[1]
+        lines = [
+            ("KAREN SPEECH RECOGNITION", (20 - x, 40 - y), 0.8, (0, 255, 0), 2),
+            (f"Status: {state.status}", (20 - x, 70 - y), 0.6, (255, 255, 255), 2)
+        ]
+        if state.listening:
+            lines.append(("LISTENING...", (20 - x, 100 - y), 0.6, (0, 255, 255), 2))
+        if state.last_heard:
+            lines.append((f"You said: {state.last_heard}", (20 - x, 130 - y), 0.5, (255, 255, 0), 2))
+        self.status_layer.draw(lines)
+
+        if state.current_animal:
+            x, y = ANIMAL_BOX[0], ANIMAL_BOX[1]
+            self.animal_layer.draw([
+                (f"Current Animal: {state.current_animal.upper()}", (20 - x, 190 - y), 0.6, (255, 255, 255), 2)
+            ])
@@ -0,0 +1,239 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from speechRecognition.metrics import metrics
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    word TEXT NOT NULL,
+    score REAL,
+    outcome TEXT NOT NULL,
+    speech_ms REAL,
+    recognize_ms REAL,
+    score_ms REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_user_time ON attempts (user_id, created_at);
+CREATE INDEX IF NOT EXISTS attempts_user_word_time ON attempts (user_id, word, created_at);
+
+-- Running totals per user and word, updated in the same transaction as attempts
+CREATE TABLE IF NOT EXISTS word_stats (
+    user_id TEXT NOT NULL,
+    word TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    scored INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,
+    best_score REAL,
+    perfect INTEGER NOT NULL DEFAULT 0,
+    last_score REAL,
+    last_at REAL,
+    PRIMARY KEY (user_id, word)
+) WITHOUT ROWID;
+"""
+
+INSERT_ATTEMPT = """
+INSERT INTO attempts (user_id, word, score, outcome, speech_ms, recognize_ms, score_ms, created_at)
+VALUES (:user_id, :word, :score, :outcome, :speech_ms, :recognize_ms, :score_ms, :created_at)
+"""
+
+UPSERT_WORD_STATS = """
+INSERT INTO word_stats (user_id, word, attempts, scored, score_sum, best_score, perfect, last_score, last_at)
+VALUES (:user_id, :word, 1, :score IS NOT NULL, COALESCE(:score, 0), :score, :outcome = 'perfect', :score, :created_at)
+ON CONFLICT (user_id, word) DO UPDATE SET
+    attempts = attempts + 1,
+    scored = scored + excluded.scored,
+    score_sum = score_sum + excluded.score_sum,
+    best_score = MAX(COALESCE(best_score, excluded.best_score), COALESCE(excluded.best_score, best_score)),
+    perfect = perfect + excluded.perfect,
+    last_score = COALESCE(excluded.last_score, last_score),
+    last_at = excluded.last_at
+"""
+
+class ProgressStore:
+    """Pronunciation attempts in SQLite (WAL), written by a background batching thread.
+
+    record() only enqueues, so the command path never waits on disk. The
+    writer commits up to batch_size attempts per transaction, at least every
+    flush_interval seconds. Readers use their own connections, which WAL
+    lets run alongside the writer.
+    """
+
+    def __init__(self, path, batch_size=200, flush_interval=0.5, max_pending=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.local = threading.local()
+        self.dropped = 0
+        self.written = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Schema and WAL mode up front, so readers work before the first write
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self.running = True
+        self.writer = threading.Thread(target=self._run, daemon=True)
+        self.writer.start()
+
+    def record(self, user_id, word, score=None, outcome='unscored', speech_ms=None, recognize_ms=None,
+               score_ms=None, created_at=None):
+        """Queue one attempt; returns False (and counts it) if the writer is too far behind.
+
+        outcome is perfect, good or retry for scored attempts, unscored when
+        there was no audio to score (typed commands).
+        """
+        attempt = {
+            'user_id': user_id, 'word': word, 'score': score, 'outcome': outcome,
+            'speech_ms': speech_ms, 'recognize_ms': recognize_ms, 'score_ms': score_ms,
+            'created_at': created_at if created_at is not None else time.time()
+        }
+        try:
+            self.pending.put_nowait(attempt)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            metrics.count_error('progress', 'QueueFull')
+            return False
+
+    def flush(self, timeout=5):
+        """Block until everything queued so far is committed"""
+        done = threading.Event()
+        try:
+            self.pending.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        if not self.running:
+            return
+        self.flush(timeout)
+        self.running = False
+        try:
+            self.pending.put_nowait(None)
+        except queue.Full:
+            pass
+        self.writer.join(timeout)
+
+    def summary(self, user_id, days=30):
+        """Totals, per-word stats, daily activity and current streak for a user"""
+        conn = self._reader()
+        words = [dict(row) for row in conn.execute(
+            "SELECT word, attempts, perfect, best_score, last_score, last_at, "
+            "CASE WHEN scored THEN ROUND(score_sum / scored, 1) END AS average_score "
+            "FROM word_stats WHERE user_id = ? ORDER BY last_at DESC", (user_id,))]
+
+        attempts = sum(w['attempts'] for w in words)
+        totals = conn.execute(
+            "SELECT SUM(score_sum), SUM(scored) FROM word_stats WHERE user_id = ?", (user_id,)).fetchone()
+        average = round(totals[0] / totals[1], 1) if totals[1] else None
+
+        since = time.time() - days * 86400
+        daily = [dict(row) for row in conn.execute(
+            "SELECT date(created_at, 'unixepoch', 'localtime') AS day, COUNT(*) AS attempts, "
+            "ROUND(AVG(score), 1) AS average_score "
+            "FROM attempts WHERE user_id = ? AND created_at >= ? GROUP BY day ORDER BY day", (user_id, since))]
+
+        return {
+            "user_id": user_id,
+            "attempts": attempts,
+            "perfect": sum(w['perfect'] for w in words),
+            "average_score": average,
+            "words": words,
+            "daily": daily,
+            "streak": self._streak([d['day'] for d in daily])
+        }
+
+    def recent(self, user_id, word=None, limit=50):
+        """Latest attempts, newest first"""
+        conn = self._reader()
+        if word:
+            rows = conn.execute(
+                "SELECT * FROM attempts WHERE user_id = ? AND word = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, word, limit))
+        else:
+            rows = conn.execute(
+                "SELECT * FROM attempts WHERE user_id = ? ORDER BY created_at DESC LIMIT ?", (user_id, limit))
+        return [dict(row) for row in rows]
+
+    def stats(self):
+        return {"pending": self.pending.qsize(), "written": self.written, "dropped": self.dropped}
+
+    def _streak(self, days):
+        # Consecutive days with attempts, ending today or yesterday
+        active = set(days)
+        day = time.time()
+        if time.strftime('%Y-%m-%d', time.localtime(day)) not in active:
+            day -= 86400
+        streak = 0
+        while time.strftime('%Y-%m-%d', time.localtime(day)) in active:
+            streak += 1
+            day -= 86400
+        return streak
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at checkpoints; a crash can lose only the last batches
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            self.local.conn = conn
+        return conn
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while self.running:
+                item = self.pending.get()
+                batch, waiters = [], []
+                deadline = time.monotonic() + self.flush_interval
+                # Gather until the batch is full or the flush interval passes
+                while item is not None:
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self.pending.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write(conn, batch)
+                for waiter in waiters:
+                    waiter.set()
+                if item is None:
+                    break
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch):
+        started = time.perf_counter()
+        try:
+            with conn:
+                conn.executemany(INSERT_ATTEMPT, batch)
+                conn.executemany(UPSERT_WORD_STATS, batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            metrics.count_error('progress', e)
+            print(f"[PROGRESS]: Write failed, dropped {len(batch)} attempts: {e}")
+        metrics.observe('progress_write', time.perf_counter() - started)
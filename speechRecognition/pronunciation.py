@@ -0,0 +1,196 @@
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+FRAME_MS = 25
+HOP_MS = 10
+
+# ARPAbet pronunciations for the practice vocabulary
+LEXICON = {
+    'rabbit': ('R', 'AE', 'B', 'IH', 'T'),
+    'lion': ('L', 'AY', 'AH', 'N'),
+    'tiger': ('T', 'AY', 'G', 'ER'),
+    'snake': ('S', 'N', 'EY', 'K'),
+    'lemon': ('L', 'EH', 'M', 'AH', 'N'),
+    'rainbow': ('R', 'EY', 'N', 'B', 'OW')
+}
+
+# Broad acoustic class of each phoneme
+PHONEME_CLASSES = {
+    'vowel': ('AA', 'AE', 'AH', 'AO', 'AW', 'AY', 'EH', 'ER', 'EY', 'IH', 'IY', 'OW', 'OY', 'UH', 'UW'),
+    'approximant': ('L', 'R', 'W', 'Y'),
+    'nasal': ('M', 'N', 'NG'),
+    'fricative': ('F', 'V', 'TH', 'DH', 'S', 'Z', 'SH', 'ZH', 'HH'),
+    'stop': ('P', 'B', 'T', 'D', 'K', 'G', 'CH', 'JH')
+}
+CLASS_NAMES = ('silence',) + tuple(PHONEME_CLASSES)
+CLASS_OF = {phoneme: CLASS_NAMES.index(name) for name, phonemes in PHONEME_CLASSES.items() for phoneme in phonemes}
+
+# Per-class Gaussian over frame features:
+# (log energy z-score, zero-crossing rate, energy share above 4 kHz, energy share below 1 kHz)
+CLASS_MEANS = np.array([
+    [-1.6, 0.10, 0.20, 0.40],  # silence
+    [0.8, 0.05, 0.03, 0.65],   # vowel
+    [0.4, 0.06, 0.04, 0.55],   # approximant
+    [0.1, 0.04, 0.02, 0.80],   # nasal
+    [-0.1, 0.35, 0.50, 0.10],  # fricative
+    [-0.6, 0.20, 0.30, 0.30]   # stop
+], dtype=np.float32)
+CLASS_STDS = np.array([
+    [0.6, 0.10, 0.20, 0.25],
+    [0.6, 0.04, 0.05, 0.20],
+    [0.6, 0.04, 0.05, 0.20],
+    [0.6, 0.04, 0.04, 0.15],
+    [0.7, 0.12, 0.20, 0.10],
+    [0.7, 0.12, 0.20, 0.20]
+], dtype=np.float32)
+
+
+def class_posteriors(loglik):
+    """Frames x classes posteriors from log likelihoods, equal priors"""
+    posteriors = np.exp(loglik - loglik.max(axis=1, keepdims=True))
+    return posteriors / posteriors.sum(axis=1, keepdims=True)
+
+
+def to_samples(audio, sample_rate=SAMPLE_RATE):
+    """Float32 mono samples from sr.AudioData, 16-bit PCM bytes or an array"""
+    if hasattr(audio, 'get_raw_data'):
+        audio = audio.get_raw_data(convert_rate=sample_rate, convert_width=2)
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        audio = np.frombuffer(audio, dtype=np.int16)
+    samples = np.asarray(audio)
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32)
+
+
+def frame_features(samples, sample_rate=SAMPLE_RATE):
+    """Per-frame feature matrix (frames x 4) and raw log energy"""
+    frame_len = sample_rate * FRAME_MS // 1000
+    hop = sample_rate * HOP_MS // 1000
+    if len(samples) < frame_len:
+        return np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_len)[::hop]
+    log_energy = np.log(np.mean(frames ** 2, axis=1) + 1e-10)
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame_len), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frame_len, 1.0 / sample_rate)
+    total = power.sum(axis=1) + 1e-10
+    high = power[:, freqs >= 4000].sum(axis=1) / total
+    low = power[:, freqs < 1000].sum(axis=1) / total
+
+    energy_z = (log_energy - log_energy.mean()) / (log_energy.std() + 1e-6)
+    features = np.stack([energy_z, zcr, high, low], axis=1).astype(np.float32)
+    return features, log_energy
+
+
+def class_log_likelihoods(features):
+    """Frames x classes diagonal-Gaussian log likelihoods"""
+    diff = (features[:, None, :] - CLASS_MEANS[None, :, :]) / CLASS_STDS[None, :, :]
+    return -0.5 * np.sum(diff ** 2, axis=2)
+
+
+# Posterior of each class for a frame on its own mean. The classes overlap, so this
+# is the best a phoneme can reach (about 0.5 for vowels); scores are relative to it
+CLASS_PEAKS = np.diag(class_posteriors(class_log_likelihoods(CLASS_MEANS)))
+
+
+def speech_bounds(log_energy):
+    """First and last frame above an adaptive energy threshold"""
+    floor = np.percentile(log_energy, 10)
+    threshold = floor + 0.35 * (log_energy.max() - floor)
+    voiced = np.flatnonzero(log_energy > threshold)
+    if len(voiced) == 0:
+        return 0, 0
+    return voiced[0], voiced[-1] + 1
+
+
+def force_align(emissions):
+    """Left-to-right Viterbi; returns the state index of every frame"""
+    frames, states = emissions.shape
+    scores = np.full(states, -np.inf)
+    scores[0] = emissions[0, 0]
+    advanced = np.zeros((frames, states), dtype=bool)
+
+    for t in range(1, frames):
+        shifted = np.concatenate(([-np.inf], scores[:-1]))
+        advanced[t] = shifted > scores
+        scores = np.maximum(scores, shifted) + emissions[t]
+
+    path = np.empty(frames, dtype=np.int64)
+    state = states - 1
+    for t in range(frames - 1, -1, -1):
+        path[t] = state
+        if advanced[t, state]:
+            state -= 1
+    return path
+
+
+class PronunciationScorer:
+    """Scores a spoken word against its expected phoneme sequence.
+
+    Frames are classified into broad phoneme classes, force-aligned to the
+    word's phonemes, and each phoneme is scored by how strongly its frames
+    match the expected class.
+    """
+
+    def __init__(self, lexicon=None, sample_rate=SAMPLE_RATE):
+        self.lexicon = dict(LEXICON if lexicon is None else lexicon)
+        self.sample_rate = sample_rate
+
+    def phonemes(self, word):
+        return self.lexicon.get(word.lower())
+
+    def score(self, audio, word):
+        """Return {"word", "score", "phonemes": [...]} or None for unknown words"""
+        phonemes = self.phonemes(word)
+        if not phonemes:
+            return None
+
+        samples = to_samples(audio, self.sample_rate)
+        features, log_energy = frame_features(samples, self.sample_rate)
+        start, end = speech_bounds(log_energy) if len(log_energy) else (0, 0)
+        if end - start < len(phonemes):
+            return self._result(word, [(phoneme, 0.0, None, None) for phoneme in phonemes])
+
+        loglik = class_log_likelihoods(features[start:end])
+        posteriors = class_posteriors(loglik)
+
+        classes = np.array([CLASS_OF.get(phoneme, 1) for phoneme in phonemes])
+        # Neighbouring phonemes of one class look alike to the classifier (the AY AH of
+        # lion): align them as one segment and split its frames evenly between them
+        firsts = np.flatnonzero(np.concatenate(([True], classes[1:] != classes[:-1])))
+        sizes = np.diff(np.append(firsts, len(classes)))
+        segment_path = force_align(loglik[:, classes[firsts]])
+        path = np.empty_like(segment_path)
+        for segment, (first, size) in enumerate(zip(firsts, sizes)):
+            frames = np.flatnonzero(segment_path == segment)
+            path[frames] = first + np.arange(len(frames)) * size // len(frames)
+
+        # Mean posterior of the expected class over each phoneme's frames, relative to its peak
+        frame_scores = np.minimum(posteriors[np.arange(len(path)), classes[path]] / CLASS_PEAKS[classes[path]], 1.0)
+        counts = np.bincount(path, minlength=len(phonemes))
+        totals = np.bincount(path, weights=frame_scores, minlength=len(phonemes))
+        means = totals / np.maximum(counts, 1)
+        # Phonemes squeezed into a single frame were most likely skipped
+        means = np.where(counts < 2, means * 0.5, means)
+
+        bounds = (start + np.concatenate(([0], np.cumsum(counts)))) * (HOP_MS / 1000.0)
+        results = []
+        for i, phoneme in enumerate(phonemes):
+            results.append((phoneme, float(means[i]) * 100,
+                            round(float(bounds[i]), 3), round(float(bounds[i + 1]), 3)))
+        return self._result(word, results)
+
+    def _result(self, word, results):
+        scores = [score for _, score, _, _ in results]
+        return {
+            "word": word,
+            "score": round(float(np.mean(scores)), 1) if scores else 0.0,
+            "phonemes": [
+                {"phoneme": phoneme, "score": round(score, 1), "start": start, "end": end}
+                for phoneme, score, start, end in results
+            ]
+        }
@@ -0,0 +1,164 @@
+import json
+
+import speech_recognition as sr
+
+
+class RecognitionStream:
+    """One utterance being recognized as audio arrives"""
+
+    def accept(self, audio):
+        """Feed an sr.AudioData chunk; returns the partial hypothesis or None"""
+        raise NotImplementedError
+
+    def result(self):
+        """Final transcript; raises sr.UnknownValueError if nothing was recognized"""
+        raise NotImplementedError
+
+
+class RecognizerBackend:
+    """Speech-to-text backend used by Karen.listen_once"""
+    name = 'base'
+    # True if the backend can restrict recognition to a fixed vocabulary
+    supports_vocabulary = False
+
+    def start(self, vocabulary=None):
+        """Begin a new utterance and return its RecognitionStream"""
+        raise NotImplementedError
+
+    def recognize(self, audio, vocabulary=None):
+        """Recognize a complete sr.AudioData clip"""
+        stream = self.start(vocabulary)
+        stream.accept(audio)
+        return stream.result()
+
+
+class GoogleRecognizer(RecognizerBackend):
+    """Google Web Speech API; needs network and has no partial results"""
+    name = 'google'
+
+    def __init__(self, recognizer=None, language='en-US'):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+
+    def start(self, vocabulary=None):
+        return _BufferedStream(self, vocabulary)
+
+    def recognize(self, audio, vocabulary=None):
+        # Open vocabulary only, the command matcher filters the transcript
+        return self.recognizer.recognize_google(audio, language=self.language)  # type: ignore
+
+
+class SphinxKeywordRecognizer(RecognizerBackend):
+    """Offline PocketSphinx keyword spotting over the active vocabulary"""
+    name = 'sphinx'
+    supports_vocabulary = True
+
+    def __init__(self, recognizer=None, sensitivity=0.8, language='en-US'):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.sensitivity = sensitivity
+        self.language = language
+
+    def start(self, vocabulary=None):
+        return _BufferedStream(self, vocabulary)
+
+    def recognize(self, audio, vocabulary=None):
+        if not vocabulary:
+            return self.recognizer.recognize_sphinx(audio, language=self.language)
+        keywords = [(word, self.sensitivity) for word in vocabulary]
+        text = self.recognizer.recognize_sphinx(audio, language=self.language, keyword_entries=keywords)
+        # Sphinx reports keyword hits with trailing spaces and repeats
+        return ' '.join(text.split())
+
+
+class _BufferedStream(RecognitionStream):
+    # Collects chunks and sends the whole clip at the end
+    def __init__(self, backend, vocabulary=None):
+        self.backend = backend
+        self.vocabulary = vocabulary
+        self.chunks = []
+        self.sample_rate = None
+        self.sample_width = None
+
+    def accept(self, audio):
+        self.sample_rate = audio.sample_rate
+        self.sample_width = audio.sample_width
+        self.chunks.append(audio.get_raw_data())
+        return None
+
+    def result(self):
+        if not self.chunks:
+            raise sr.UnknownValueError()
+        audio = sr.AudioData(b''.join(self.chunks), self.sample_rate, self.sample_width)
+        return self.backend.recognize(audio, self.vocabulary)
+
+
+class VoskRecognizer(RecognizerBackend):
+    """Offline streaming recognizer backed by a local Vosk model"""
+    name = 'vosk'
+    supports_vocabulary = True
+
+    def __init__(self, model_path, sample_rate=16000):
+        try:
+            import vosk
+        except ImportError:
+            raise RuntimeError("Vosk backend needs the 'vosk' package (pip install vosk)")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        # The model is shared; each utterance gets its own KaldiRecognizer
+        self.model = vosk.Model(model_path)
+        self.sample_rate = sample_rate
+        # Vocabulary tuple -> compiled grammar JSON
+        self.grammars = {}
+
+    def start(self, vocabulary=None):
+        if vocabulary:
+            recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate, self.grammar(vocabulary))
+        else:
+            recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+        return _VoskStream(recognizer, self.sample_rate)
+
+    def grammar(self, vocabulary):
+        """Constrained grammar for vocabulary; anything else decodes as [unk]"""
+        key = tuple(vocabulary)
+        grammar = self.grammars.get(key)
+        if grammar is None:
+            grammar = json.dumps(list(key) + ['[unk]'])
+            self.grammars[key] = grammar
+        return grammar
+
+
+class _VoskStream(RecognitionStream):
+    def __init__(self, recognizer, sample_rate):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        # Finalized segments when Vosk detects a pause mid-utterance
+        self.segments = []
+
+    def accept(self, audio):
+        pcm = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        if self.recognizer.AcceptWaveform(pcm):
+            text = json.loads(self.recognizer.Result()).get('text', '')
+            if text:
+                self.segments.append(text)
+            return ' '.join(self.segments) or None
+        partial = json.loads(self.recognizer.PartialResult()).get('partial', '')
+        return ' '.join(self.segments + [partial]).strip() or None
+
+    def result(self):
+        text = json.loads(self.recognizer.FinalResult()).get('text', '')
+        text = ' '.join(self.segments + [text]).replace('[unk]', '')
+        text = ' '.join(text.split())
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+def create_recognizer(name='google', **options):
+    """Build a backend by name: 'google', 'sphinx' or 'vosk' (needs model_path)"""
+    if name == 'google':
+        return GoogleRecognizer(**options)
+    if name == 'sphinx':
+        return SphinxKeywordRecognizer(**options)
+    if name == 'vosk':
+        return VoskRecognizer(**options)
+    raise ValueError(f"Unknown recognizer backend: {name}")
@@ -1,82 +1,293 @@
 import speech_recognition as sr
-import pyttsx3
-import requests
-from PIL import Image
-from io import BytesIO
-import matplotlib.pyplot as plt
-import cv2
+import sys
 import time
 import threading
 import logging
-import numpy as np
+from collections import namedtuple
+from speechRecognition.images import ImageCache
+from speechRecognition.tts import SpeechQueue, AudioCache, WavPlayer
+from speechRecognition.recognizers import GoogleRecognizer
+from speechRecognition.matcher import CommandMatcher
+from speechRecognition.frames import FrameBroadcaster
+from speechRecognition.metrics import metrics
+# pyttsx3, cv2, matplotlib and numpy (VAD, pronunciation) are imported where they are first used,
+# so importing this module (and starting the API server) does not pay for them
+
+# Animal images
+ANIMAL_IMAGES = {
+    'rabbit': 'https://images.unsplash.com/photo-1585110396000-c9ffd4e4b308?w=800',
+    'lion': 'https://images.unsplash.com/photo-1546182990-dffeafbe841d?w=800',
+    'tiger': 'https://images.unsplash.com/photo-1561731216-c3a4d99437d5?w=800',
+    'snake': 'https://images.unsplash.com/photo-1516728778615-2d590ea18d8d?w=800',
+    'lemon': 'https://images.unsplash.com/photo-1582287104445-6754664dbdb2?w=800',
+    'rainbow': 'https://images.unsplash.com/photo-1533984649377-c20fc524425b?w=800'
+}
+
+# Words that end the session
+EXIT_WORDS = ('exit', 'quit', 'stop', 'bye', 'goodbye')
+# Carrier phrase in front of animal names
+SHOW_PHRASE = 'show me'
+
+# Fixed prompts, rendered once into the speech cache
+GREETING_PROMPTS = (
+    "Hello! I am Karen. I can show you animal pictures.",
+    "Say 'show me' followed by rabbit, lion, tiger, snake, lemon, or rainbow."
+)
+HELP_PROMPT = "I can show you rabbit, lion, tiger, snake, lemon, or rainbow. Just say show me and the animal name."
+GOODBYE_PROMPT = "Goodbye!"
+# Per-animal templates, formatted with animal=
+SELECTED_PROMPT = "Great! You want to see a {animal}. Let me show you."
+SHOWING_PROMPT = "Here is a beautiful {animal}! Now say the word {animal} clearly for pronunciation practice."
+PERFECT_PROMPT = "Excellent! Perfect pronunciation of {animal}!"
+GOOD_PROMPT = "Good job! That sounded like {animal}. Let's try it once more."
+RETRY_PROMPT = "Nice try! Listen carefully and say {animal} again."
+ANIMAL_PROMPTS = (SELECTED_PROMPT, SHOWING_PROMPT, PERFECT_PROMPT, GOOD_PROMPT, RETRY_PROMPT)
+# Pronunciation score thresholds for the feedback above, kept here so text-only
+# sessions never import the NumPy scorer
+EXCELLENT_SCORE = 75
+GOOD_SCORE = 50
+
+# State attributes reported to listeners whenever they change
+STATE_FIELDS = ('status', 'listening', 'last_heard', 'partial_heard', 'current_animal', 'running', 'camera_active',
+                'speaking')
+
+# Immutable snapshot of STATE_FIELDS; a new one is swapped in on every change
+KarenState = namedtuple('KarenState', STATE_FIELDS + ('version',))
+INITIAL_STATE = KarenState(status="Ready", listening=False, last_heard="", partial_heard="", current_animal=None,
+                           running=True, camera_active=False, speaking=False, version=0)
+
+# What one command produced: the reply, the utterances spoken and the pronunciation score (or None)
+CommandResult = namedtuple('CommandResult', ('response', 'spoken', 'score'))
+
+def init_tts_engine():
+    """The local pyttsx3 engine, configured for Karen's voice; raises if TTS is unavailable"""
+    import pyttsx3
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
+    if voices and len(voices) > 0:
+        engine.setProperty('voice', voices[0].id)
+    engine.setProperty('rate', 180)
+    engine.setProperty('volume', 0.9)
+    return engine
 
 class Karen:
-    def __init__(self):
+    def __init__(self, headless=False, engine=None, microphone=None, camera=None, image_cache=None,
+                 speech_cache=None, recognizer_backend=None, keyword_spotting=False, scorer=None, display=True,
+                 frames=None):
+        """Create Karen; headless skips opening TTS, microphone and camera, display opens a camera window"""
+        # State snapshot and change listeners, must exist before any state is set
+        self.state = INITIAL_STATE
+        # Also held while listeners run, so they see changes in version order; reentrant
+        # for listeners that update state themselves
+        self.state_lock = threading.RLock()
+        self.state_listeners = []
+        # Called with every scored pronunciation attempt
+        self.attempt_listeners = []
+
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("Karen")
-        
-        # Initialize TTS
-        try:
-            self.engine = pyttsx3.init()
-            voices = self.engine.getProperty('voices')
-            if voices and len(voices) > 0:
-                self.engine.setProperty('voice', voices[0].id)
-            self.engine.setProperty('rate', 180)
-            self.engine.setProperty('volume', 0.9)
-            self.logger.info("TTS initialized")
-        except Exception as e:
-            self.logger.error(f"TTS error: {e}")
-            self.engine = None
+        self.headless = headless
 
         # Initialize speech recognition
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8
-        
+        # Speech-to-text backend, Google unless an offline one is passed in
+        self.recognizer_backend = recognizer_backend or GoogleRecognizer(self.recognizer)
+        # Constrain recognition to the command vocabulary when the backend supports it
+        self.keyword_spotting = keyword_spotting and self.recognizer_backend.supports_vocabulary
+
+        # Animal images, shared cache when provided by the server
+        self.animal_images = dict(ANIMAL_IMAGES)
+        self.image_cache = image_cache or ImageCache(self.animal_images)
+        self.build_matcher()
+        self.pronunciation_scorer = scorer
+        self.speech_cache = speech_cache if speech_cache is not None else AudioCache()
+
+        # State variables (status, listening, current_animal, ... live in self.state)
+        # Audio of the last utterance
+        self.last_audio = None
+        # Recognition time of the last utterance, in ms
+        self.last_recognize_ms = None
+        self.last_response = ""
+        # Utterances and score of the command running on each thread
+        self.command_output = threading.local()
+
+        # Device adapters, attached on demand
+        self.engine = None
+        self.speech = None
+        self.microphone = None
+        self.endpointer = None
+        self.last_endpoint = None
+        # Set when listening failed for a reason other than silence
+        self.listen_error = None
+        self.cap = None
+        self.camera_thread = None
+        self.display = display
+        # Annotated camera frames for streaming clients
+        self.frames = frames or FrameBroadcaster()
+
+        if engine or not headless:
+            self.attach_tts(engine)
+        if microphone or not headless:
+            self.attach_microphone(microphone)
+        if camera or not headless:
+            self.attach_camera(camera)
+
+    @property
+    def scorer(self):
+        """Pronunciation scorer, created on first use"""
+        if self.pronunciation_scorer is None:
+            from speechRecognition.pronunciation import PronunciationScorer
+            self.pronunciation_scorer = PronunciationScorer()
+        return self.pronunciation_scorer
+
+    def __getattr__(self, name):
+        # Only reached for names not in __dict__: state fields read from the snapshot
+        if name in STATE_FIELDS:
+            return getattr(self.state, name)
+        raise AttributeError(f"'Karen' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        if name in STATE_FIELDS:
+            self.update_state(**{name: value})
+        else:
+            object.__setattr__(self, name, value)
+
+    def update_state(self, **changes):
+        """Apply changes as one new snapshot, so readers never see a half-applied update"""
+        with self.state_lock:
+            current = self.state
+            changes = {k: v for k, v in changes.items() if getattr(current, k) != v}
+            if not changes:
+                return current
+            state = current._replace(version=current.version + 1, **changes)
+            object.__setattr__(self, 'state', state)
+            
+            for listener in list(self.state_listeners):
+                try:
+                    listener(changes, state)
+                except Exception as e:
+                    print(f"[KAREN]: State listener error: {e}")
+        return state
+
+    def add_state_listener(self, listener):
+        """Call listener(changes, state) after every state change"""
+        self.state_listeners.append(listener)
+
+    def remove_state_listener(self, listener):
+        if listener in self.state_listeners:
+            self.state_listeners.remove(listener)
+
+    def add_attempt_listener(self, listener):
+        """Call listener(attempt) after every pronunciation check, attempt is a dict"""
+        self.attempt_listeners.append(listener)
+
+    def notify_attempt(self, animal, score, outcome, audio, score_ms):
+        if not self.attempt_listeners:
+            return
+        attempt = {"word": animal, "score": score, "outcome": outcome,
+                   "speech_ms": None, "recognize_ms": None, "score_ms": score_ms}
+        # Timings belong to the recognized utterance; typed commands have none
+        if hasattr(audio, 'frame_data'):
+            attempt["speech_ms"] = len(audio.frame_data) / (audio.sample_rate * audio.sample_width) * 1000
+            attempt["recognize_ms"] = self.last_recognize_ms
+        for listener in list(self.attempt_listeners):
+            try:
+                listener(attempt)
+            except Exception as e:
+                print(f"[KAREN]: Attempt listener error: {e}")
+
+    def attach_tts(self, engine=None):
+        """Attach a TTS engine (anything with say/runAndWait/stop)"""
+        player = None
+        if engine is None:
+            try:
+                engine = init_tts_engine()
+                self.logger.info("TTS initialized")
+            except Exception as e:
+                self.logger.error(f"TTS error: {e}")
+                engine = None
+            player = self.create_player()
+        self.engine = engine
+        if engine is not None:
+            # Playback runs on a worker thread that owns the engine
+            self.speech = SpeechQueue(engine, on_state=self.set_speaking, audio_cache=self.speech_cache,
+                                      player=player)
+        return self.engine is not None
+
+    def create_player(self):
+        """Speaker output for cached prompt audio, None without PyAudio"""
         try:
-            self.microphone = sr.Microphone()
-            with self.microphone as source:
-                print("Calibrating microphone...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
+            return WavPlayer()
+        except Exception as e:
+            self.logger.info(f"Cached prompt playback off: {e}")
+            return None
+
+    def set_speaking(self, speaking):
+        self.speaking = speaking
+
+    def build_matcher(self):
+        """Compile the command vocabulary; call again after changing animal_images"""
+        matcher = CommandMatcher()
+        for word in EXIT_WORDS:
+            matcher.add(word, 'exit', priority=0)
+        matcher.add(SHOW_PHRASE, 'show', priority=2)
+        for animal in self.animal_images:
+            matcher.add(animal, 'animal', animal, priority=1)
+            matcher.add(animal + 's', 'animal', animal, priority=1)
+        self.matcher = matcher
+
+    def command_vocabulary(self):
+        """Every word or phrase process_command acts on"""
+        return [SHOW_PHRASE] + list(EXIT_WORDS) + list(self.animal_images.keys())
+
+    def prompt_texts(self):
+        """Every fixed utterance Karen can say for the current animals"""
+        texts = list(GREETING_PROMPTS) + [HELP_PROMPT, GOODBYE_PROMPT]
+        for animal in self.animal_images:
+            texts.extend(template.format(animal=animal) for template in ANIMAL_PROMPTS)
+        return texts
+
+    def warm_speech_cache(self):
+        """Render fixed prompts in the background so they are served from memory"""
+        if self.speech:
+            return self.speech.warm(self.prompt_texts())
+        return 0
+
+    def attach_microphone(self, microphone=None, calibrate=False):
+        """Attach a microphone (any speech_recognition AudioSource); the VAD learns the noise floor itself"""
+        try:
+            if microphone is None:
+                microphone = sr.Microphone()
+            if calibrate:
+                with microphone as source:
+                    print("Calibrating microphone...")
+                    self.recognizer.adjust_for_ambient_noise(source, duration=2)
+            self.microphone = microphone
             print("Microphone ready!")
         except Exception as e:
             print(f"Microphone error: {e}")
             self.microphone = None
+        return self.microphone is not None
+
+    def attach_camera(self, cap=None):
+        """Attach a camera and start the capture loop"""
+        self.initialize_camera(cap)
 
-        # Animal images
-        self.animal_images = {
-            'rabbit': 'https://images.unsplash.com/photo-1585110396000-c9ffd4e4b308?w=800',
-            'lion': 'https://images.unsplash.com/photo-1546182990-dffeafbe841d?w=800',
-            'tiger': 'https://images.unsplash.com/photo-1561731216-c3a4d99437d5?w=800',
-            'snake': 'https://images.unsplash.com/photo-1516728778615-2d590ea18d8d?w=800',
-            'lemon': 'https://images.unsplash.com/photo-1582287104445-6754664dbdb2?w=800',
-            'rainbow': 'https://images.unsplash.com/photo-1533984649377-c20fc524425b?w=800'
-        }
-
-        # State variables
-        self.running = True
-        self.current_animal = None
-        self.listening = False
-        self.last_heard = ""
-        self.last_response = ""
-        self.status = "Ready"
-        
-        # Camera setup
-        self.cap = None
-        self.camera_active = False
-        self.initialize_camera()
-        
         # Start camera thread
         if self.cap:
             self.camera_thread = threading.Thread(target=self.camera_loop, daemon=True)
             self.camera_thread.start()
+        return self.camera_active
 
-    def initialize_camera(self):
+    def initialize_camera(self, cap=None):
         """Initialize camera"""
         try:
-            self.cap = cv2.VideoCapture(0)
+            import cv2
+            self.cap = cap if cap is not None else cv2.VideoCapture(0)
             if self.cap.isOpened():
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 800)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 600)
@@ -91,135 +302,184 @@ class Karen:
             self.cap = None
 
     def camera_loop(self):
-        """Camera display loop with status"""
+        """Single capture loop: annotates each frame, feeds streaming clients and the optional window"""
+        import cv2
+        from speechRecognition.overlay import OverlayRenderer
+        renderer = OverlayRenderer(self.animal_images.keys())
+        capture = None
         while self.running and self.cap and self.cap.isOpened():
             try:
-                ret, frame = self.cap.read()
+                # Decode into the same buffer every frame
+                ret, capture = self.cap.read(capture)
                 if not ret:
                     continue
                 
-                # Flip frame for mirror effect
-                frame = cv2.flip(frame, 1)
-                
-                # Create overlay for text
-                overlay = frame.copy()
-                
-                # Status box
-                cv2.rectangle(overlay, (10, 10), (780, 150), (0, 0, 0), -1)
-                cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-                
-                # Status text
-                cv2.putText(frame, "KAREN SPEECH RECOGNITION", (20, 40),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-                
-                cv2.putText(frame, f"Status: {self.status}", (20, 70),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                
-                if self.listening:
-                    cv2.putText(frame, "LISTENING...", (20, 100),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                
-                if self.last_heard:
-                    cv2.putText(frame, f"You said: {self.last_heard}", (20, 130),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
+                # Mirrored frame with status overlay, text re-rendered only when state changes
+                frame = renderer.render(capture, self.state)
                 
-                # Current animal box
-                if self.current_animal:
-                    cv2.rectangle(overlay, (10, 160), (400, 220), (0, 100, 0), -1)
-                    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-                    cv2.putText(frame, f"Current Animal: {self.current_animal.upper()}", (20, 190),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                # Encoded once here, shared by every stream client
+                self.frames.publish(frame)
                 
-                # Instructions
-                instructions = [
-                    "Say: 'show me [animal]'",
-                    "Animals: rabbit, lion, tiger, snake, lemon, rainbow",
-                    "Press 'q' to quit"
-                ]
-                
-                y_start = frame.shape[0] - 80
-                for i, instruction in enumerate(instructions):
-                    cv2.putText(frame, instruction, (20, y_start + i * 25),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-                
-                # Show frame
-                cv2.imshow('Karen Camera', frame)
-                
-                # Check for quit
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    self.running = False
-                    break
+                if self.display:
+                    cv2.imshow('Karen Camera', frame)
+                    
+                    # Check for quit
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        self.running = False
+                        break
                     
             except Exception as e:
                 print(f"Camera loop error: {e}")
                 break
         
         # Cleanup
+        self.frames.close()
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
+        if self.display:
+            cv2.destroyAllWindows()
         print("Camera closed")
 
-    def speak(self, text):
-        """Text to speech"""
+    def speak(self, text, play=True):
+        """Queue text to speech, returns without waiting for playback"""
         try:
             print(f"[KAREN SAYS]: {text}")
-            if self.engine:
-                self.engine.say(text)
-                self.engine.runAndWait()
+            spoken = getattr(self.command_output, 'spoken', None)
+            if spoken is not None:
+                spoken.append(text)
+            if play and self.speech:
+                self.speech.say(text)
         except Exception as e:
             print(f"Speech error: {e}")
 
-    def listen_once(self):
-        """Listen for one command with visual feedback"""
+    def listen_once(self, timeout=5):
+        """Listen for one command with visual feedback; timeout is the wait for speech to start"""
         if not self.microphone:
             print("[KAREN]: No microphone available")
             return None
             
         try:
-            self.listening = True
-            self.status = "Listening..."
+            self.listen_error = None
+            self.update_state(listening=True, partial_heard="", status="Listening...")
             print("[KAREN]: Listening for command...")
             
+            vocabulary = self.command_vocabulary() if self.keyword_spotting else None
+            stream = self.recognizer_backend.start(vocabulary)
+            chunks = []
             with self.microphone as source:
-                # Listen with shorter timeout for server mode
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=3)
+                if not self.endpointer or self.endpointer.sample_rate != source.SAMPLE_RATE:
+                    from speechRecognition.vad import Endpointer
+                    self.endpointer = Endpointer(source.SAMPLE_RATE)
+                endpointer = self.endpointer
+                endpointer.reset(keep_noise=True)
+                started = time.perf_counter()
+                deadline = time.time() + timeout
+                
+                # Only speech frames reach the recognizer, fed while the phrase is still being spoken
+                while True:
+                    pcm = source.stream.read(source.CHUNK)
+                    if not pcm:
+                        break
+                    speech, done = endpointer.feed(pcm)
+                    if speech:
+                        chunk = sr.AudioData(speech, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                        chunks.append(speech)
+                        partial = stream.accept(chunk)
+                        if partial:
+                            self.partial_heard = partial
+                    if done:
+                        break
+                    if not endpointer.in_speech and time.time() > deadline:
+                        raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                sample_rate, sample_width = source.SAMPLE_RATE, source.SAMPLE_WIDTH
+            
+            self.last_endpoint = endpointer.report()
+            if not chunks:
+                raise sr.WaitTimeoutError("no speech detected")
+            # Mic capture up to the endpoint, including the wait for speech to start
+            metrics.observe('capture', time.perf_counter() - started)
+            
+            # Kept for pronunciation scoring
+            self.last_audio = sr.AudioData(b''.join(chunks), sample_rate, sample_width)
                 
             self.status = "Processing..."
             print("[KAREN]: Processing speech...")
             
             # Recognize speech
-            text = self.recognizer.recognize_google(audio, language='en-US')  # type: ignore
+            recognize_started = time.perf_counter()
+            try:
+                text = stream.result()
+            finally:
+                self.last_recognize_ms = (time.perf_counter() - recognize_started) * 1000
+                metrics.observe('recognize', self.last_recognize_ms / 1000)
             text = text.lower().strip()
             
-            self.last_heard = text
-            self.status = "Ready"
-            self.listening = False
+            self.update_state(last_heard=text, partial_heard="", status="Ready", listening=False)
             
             print(f"[KAREN]: Heard: '{text}'")
             return text
             
-        except sr.WaitTimeoutError:
-            self.status = "Ready"
-            self.listening = False
+        except sr.WaitTimeoutError as e:
+            metrics.count_error('listen', e)
+            self.update_state(status="Ready", listening=False)
             # Don't print timeout in server mode - it's normal
             return None
-        except sr.UnknownValueError:
-            self.status = "Could not understand"
-            self.listening = False
+        except sr.UnknownValueError as e:
+            metrics.count_error('listen', e)
+            self.update_state(status="Could not understand", listening=False)
             print("[KAREN]: Could not understand speech")
             return None
         except sr.RequestError as e:
-            self.status = f"Recognition error: {e}"
-            self.listening = False
+            metrics.count_error('listen', e)
+            self.listen_error = e
+            self.update_state(status=f"Recognition error: {e}", listening=False)
             print(f"[KAREN]: Recognition error: {e}")
             return None
         except Exception as e:
-            self.status = f"Error: {e}"
-            self.listening = False
+            metrics.count_error('listen', e)
+            self.listen_error = e
+            self.update_state(status=f"Error: {e}", listening=False)
             print(f"[KAREN]: Listen error: {e}")
             return None
 
+    def recognize_chunks(self, pcm_chunks, sample_rate, sample_width=2):
+        """Recognize uploaded PCM as it arrives; raises the usual sr errors"""
+        self.update_state(partial_heard="", status="Processing...")
+        vocabulary = self.command_vocabulary() if self.keyword_spotting else None
+        stream = self.recognizer_backend.start(vocabulary)
+        chunks = []
+        started = time.perf_counter()
+        try:
+            for pcm in pcm_chunks:
+                chunks.append(pcm)
+                partial = stream.accept(sr.AudioData(pcm, sample_rate, sample_width))
+                if partial:
+                    self.partial_heard = partial
+            
+            # Kept for pronunciation scoring
+            self.last_audio = sr.AudioData(b''.join(chunks), sample_rate, sample_width)
+            text = stream.result().lower().strip()
+        except sr.UnknownValueError as e:
+            metrics.count_error('recognize', e)
+            self.status = "Could not understand"
+            raise
+        except sr.RequestError as e:
+            metrics.count_error('recognize', e)
+            raise
+        finally:
+            self.partial_heard = ""
+        # Upload reading and recognition together, as the two overlap
+        self.last_recognize_ms = (time.perf_counter() - started) * 1000
+        metrics.observe('recognize_upload', self.last_recognize_ms / 1000)
+        
+        self.update_state(last_heard=text, status="Ready")
+        print(f"[KAREN]: Heard (upload): '{text}'")
+        return text
+
+    def recognize_audio(self, audio):
+        """Recognize a complete sr.AudioData clip"""
+        return self.recognize_chunks([audio.get_raw_data()], audio.sample_rate, audio.sample_width)
+
     def show_image(self, animal):
         """Show animal image"""
         if animal not in self.animal_images:
@@ -229,31 +489,47 @@ class Karen:
             print(f"[KAREN]: Loading {animal} image...")
             self.status = f"Loading {animal} image..."
             
-            response = requests.get(self.animal_images[animal], timeout=10)
-            response.raise_for_status()
+            with metrics.time('image_load'):
+                img = self.image_cache.get(animal)
             
-            img = Image.open(BytesIO(response.content))
-            
-            # Show image
-            plt.figure(figsize=(10, 8))
-            plt.imshow(img)
-            plt.axis('off')
-            plt.title(f"{animal.upper()}", fontsize=20, pad=20)
-            plt.tight_layout()
-            plt.show(block=False)
-            plt.pause(0.1)
+            # Headless clients fetch the image from /api/image instead
+            if not self.headless:
+                import matplotlib.pyplot as plt
+                started = time.perf_counter()
+                plt.figure(figsize=(10, 8))
+                plt.imshow(img)
+                plt.axis('off')
+                plt.title(f"{animal.upper()}", fontsize=20, pad=20)
+                plt.tight_layout()
+                plt.show(block=False)
+                plt.pause(0.1)
+                metrics.observe('image_render', time.perf_counter() - started)
             
             self.status = f"Showing {animal}"
             print(f"[KAREN]: Showing {animal} image")
             return True
             
         except Exception as e:
+            metrics.count_error('image', e)
             print(f"[KAREN]: Image error: {e}")
             self.status = f"Image error: {e}"
             return False
 
-    def process_command(self, command):
-        """Process voice command"""
+    def process_command(self, command, play_speech=True, audio=None):
+        """Process voice command; audio is the utterance, used to score pronunciation.
+
+        Returns a CommandResult, so concurrent commands never read each other's output.
+        """
+        output = self.command_output
+        output.spoken, output.score = [], None
+        try:
+            with metrics.time('process_command'):
+                response = self.handle_command(command, play_speech, audio)
+            return CommandResult(response, output.spoken, output.score)
+        finally:
+            output.spoken = output.score = None
+
+    def handle_command(self, command, play_speech=True, audio=None):
         if not command:
             return "I didn't hear anything."
         
@@ -261,54 +537,78 @@ class Karen:
         print(f"[KAREN]: Processing command: '{command}'")
         self.status = "Processing command..."
         
-        # Check for exit
-        if any(word in command for word in ['exit', 'quit', 'stop', 'bye', 'goodbye']):
-            self.speak("Goodbye!")
-            self.running = False
-            self.status = "Goodbye!"
+        matches = self.matcher.match(command)
+        # The highest priority intent decides: exit, then an animal, then help
+        intent = self.matcher.pick(matches)
+        
+        if intent and intent.intent == 'exit':
+            self.speak(GOODBYE_PROMPT, play=play_speech)
+            self.update_state(running=False, status="Goodbye!")
             return "Goodbye!"
         
-        # Check for animals
-        found_animal = None
-        for animal in self.animal_images.keys():
-            if animal in command:
-                found_animal = animal
-                break
+        found_animal = intent.value if intent and intent.intent == 'animal' else None
+        
+        # Check pronunciation: the current word said on its own, without "show me"
+        if found_animal and found_animal == self.current_animal and 'show' not in matches:
+            return self.check_pronunciation(found_animal, audio, play_speech)
         
         if found_animal:
-            self.current_animal = found_animal
-            self.status = f"Selected: {found_animal}"
+            self.update_state(current_animal=found_animal, status=f"Selected: {found_animal}")
             
-            response_text = f"Great! You want to see a {found_animal}. Let me show you."
-            self.speak(response_text)
+            self.speak(SELECTED_PROMPT.format(animal=found_animal), play=play_speech)
             
             if self.show_image(found_animal):
-                self.speak(f"Here is a beautiful {found_animal}! Now say the word {found_animal} clearly for pronunciation practice.")
+                self.speak(SHOWING_PROMPT.format(animal=found_animal), play=play_speech)
                 return f"Showing {found_animal} image. Now practice saying '{found_animal}'"
             else:
                 return f"Sorry, couldn't load {found_animal} image."
         
-        # Check pronunciation
-        if self.current_animal and self.current_animal in command:
-            self.speak(f"Excellent! Perfect pronunciation of {self.current_animal}!")
-            response = f"Perfect pronunciation of {self.current_animal}!"
-            self.current_animal = None
-            self.status = "Ready for next animal"
-            return response
-        
         # Help message
         animals = ", ".join(self.animal_images.keys())
         help_msg = f"Say 'show me' followed by: {animals}"
-        self.speak("I can show you rabbit, lion, tiger, snake, lemon, or rainbow. Just say show me and the animal name.")
+        self.speak(HELP_PROMPT, play=play_speech)
         self.status = "Waiting for command"
         return help_msg
 
+    def check_pronunciation(self, animal, audio=None, play_speech=True):
+        """Score the practice word; without audio the transcript match counts as perfect"""
+        result = None
+        score_ms = None
+        if audio is not None:
+            started = time.perf_counter()
+            result = self.scorer.score(audio, animal)
+            score_ms = (time.perf_counter() - started) * 1000
+            metrics.observe('pronunciation', score_ms / 1000)
+        self.command_output.score = result
+        score = result["score"] if result else None
+        
+        if score is None or score >= EXCELLENT_SCORE:
+            # Without audio the word counts as said, but the attempt is recorded unscored
+            self.notify_attempt(animal, score, 'perfect' if score is not None else 'unscored', audio, score_ms)
+            self.speak(PERFECT_PROMPT.format(animal=animal), play=play_speech)
+            response = f"Perfect pronunciation of {animal}!"
+        else:
+            # Keep the same word: the prompt asks the learner to say it again
+            if score >= GOOD_SCORE:
+                self.notify_attempt(animal, score, 'good', audio, score_ms)
+                self.speak(GOOD_PROMPT.format(animal=animal), play=play_speech)
+                response = f"Good pronunciation of {animal} ({score:.0f}/100), try it once more"
+            else:
+                self.notify_attempt(animal, score, 'retry', audio, score_ms)
+                self.speak(RETRY_PROMPT.format(animal=animal), play=play_speech)
+                response = f"Keep practicing {animal} ({score:.0f}/100)"
+            self.status = f"Practicing {animal}"
+            return response
+        
+        self.update_state(current_animal=None, status="Ready for next animal")
+        return response
+
     def run(self):
         """Main run loop for server mode"""
         try:
             self.status = "Starting..."
-            self.speak("Hello! I am Karen. I can show you animal pictures.")
-            self.speak("Say 'show me' followed by rabbit, lion, tiger, snake, lemon, or rainbow.")
+            for prompt in GREETING_PROMPTS:
+                self.speak(prompt)
             self.status = "Ready - listening for voice commands"
             
             while self.running:
@@ -321,16 +621,16 @@ class Karen:
         """Interactive mode with continuous listening"""
         try:
             self.status = "Starting..."
-            self.speak("Hello! I am Karen. I can show you animal pictures.")
-            self.speak("Say 'show me' followed by rabbit, lion, tiger, snake, lemon, or rainbow.")
+            for prompt in GREETING_PROMPTS:
+                self.speak(prompt)
             self.status = "Ready - say 'show me [animal]'"
             
             while self.running:
                 command = self.listen_once()
                 if command:
-                    response = self.process_command(command)
+                    response = self.process_command(command, audio=self.last_audio).response
                     print(f"[KAREN]: Response: {response}")
-                else:
+                elif self.listen_error:
                     time.sleep(1)
                     
         except KeyboardInterrupt:
@@ -343,20 +643,28 @@ class Karen:
     def stop_interaction(self):
         """Stop Karen"""
         print("[KAREN]: Stopping...")
-        self.running = False
-        self.status = "Stopped"
+        self.update_state(running=False, status="Stopped")
         
+        self.frames.close()
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
-        plt.close('all')
+        if self.camera_thread and self.display:
+            import cv2
+            cv2.destroyAllWindows()
+        # Only close figures if show_image ever loaded matplotlib
+        if 'matplotlib.pyplot' in sys.modules:
+            import matplotlib.pyplot as plt
+            plt.close('all')
         
-        if self.engine:
+        if self.speech:
+            self.speech.stop()
+        elif self.engine:
             try:
                 self.engine.stop()
             except:
                 pass
 
 if __name__ == "__main__":
+    # Run from the repo root: python -m speechRecognition.speech
     karen = Karen()
     karen.run_interactive()
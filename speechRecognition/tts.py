@@ -0,0 +1,234 @@
+import io
+import os
+import queue
+import tempfile
+import threading
+import wave
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+from speechRecognition.metrics import metrics
+
+
+class AudioCache:
+    """Thread-safe LRU of synthesized WAV bytes keyed by utterance text"""
+
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        with self.lock:
+            wav = self.items.get(text)
+            if wav is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(text)
+            self.hits += 1
+            return wav
+
+    def put(self, text, wav):
+        with self.lock:
+            self.items[text] = wav
+            self.items.move_to_end(text)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+
+    def __contains__(self, text):
+        with self.lock:
+            return text in self.items
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.items), "hits": self.hits, "misses": self.misses}
+
+
+class WavPlayer:
+    """Plays WAV bytes on the default output device through PyAudio"""
+
+    def __init__(self):
+        import pyaudio
+        self.audio = pyaudio.PyAudio()
+
+    def play(self, wav):
+        with wave.open(io.BytesIO(wav), 'rb') as f:
+            stream = self.audio.open(format=self.audio.get_format_from_width(f.getsampwidth()),
+                                     channels=f.getnchannels(), rate=f.getframerate(), output=True)
+            try:
+                data = f.readframes(1024)
+                while data:
+                    stream.write(data)
+                    data = f.readframes(1024)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+
+class SpeechQueue:
+    """Background TTS worker; owns the engine so callers never wait on playback.
+
+    With a player, texts already in the audio cache are played from their
+    WAV bytes instead of being synthesized again by the engine.
+    """
+
+    def __init__(self, engine, max_pending=64, on_state=None, audio_cache=None, player=None):
+        self.engine = engine
+        self.player = player
+        self.audio_cache = audio_cache if audio_cache is not None else AudioCache()
+        self.jobs = queue.Queue(maxsize=max_pending)
+        # Warm-up texts, rendered only while no say or synthesize job is waiting
+        self.warm_texts = deque()
+        # Called with True/False when playback starts/stops
+        self.on_state = on_state
+        self.speaking = False
+        self.current_text = None
+        self.running = True
+
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def say(self, text):
+        """Queue text for local playback; returns False if the queue is full"""
+        try:
+            self.jobs.put_nowait(('say', text, None))
+            return True
+        except queue.Full:
+            print(f"[TTS]: Queue full, dropping: {text}")
+            return False
+
+    def synthesize(self, text, timeout=15):
+        """Render text to WAV bytes without playing it, served from cache when possible"""
+        wav = self.audio_cache.get(text)
+        if wav is not None:
+            return wav
+        if not hasattr(self.engine, 'save_to_file'):
+            raise RuntimeError("TTS engine cannot synthesize to audio")
+        result = Future()
+        self.jobs.put(('save', text, result), timeout=timeout)
+        return result.result(timeout=timeout)
+
+    def warm(self, texts):
+        """Queue low-priority rendering of texts not yet cached, without waiting"""
+        if not hasattr(self.engine, 'save_to_file'):
+            return 0
+        queued = 0
+        for text in texts:
+            if text in self.audio_cache:
+                continue
+            self.warm_texts.append(text)
+            queued += 1
+        if queued:
+            # Wakes an idle worker; a busy one reaches the texts once the queue drains
+            try:
+                self.jobs.put_nowait(('warm', None, None))
+            except queue.Full:
+                pass
+        return queued
+
+    def depth(self):
+        return self.jobs.qsize()
+
+    def state(self):
+        return {
+            "queue_depth": self.depth(),
+            "speaking": self.speaking,
+            "current_text": self.current_text
+        }
+
+    def clear(self):
+        """Drop queued utterances that have not started playing"""
+        self.warm_texts.clear()
+        while True:
+            try:
+                _, _, result = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if result:
+                result.cancel()
+
+    def stop(self):
+        self.running = False
+        self.clear()
+        try:
+            self.jobs.put_nowait(None)
+        except queue.Full:
+            pass
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+
+    def _set_speaking(self, speaking, text=None):
+        self.speaking = speaking
+        self.current_text = text
+        if self.on_state:
+            self.on_state(speaking)
+
+    def _next_job(self):
+        try:
+            return self.jobs.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return ('save', self.warm_texts.popleft(), Future())
+        except IndexError:
+            return self.jobs.get()
+
+    def _run(self):
+        while self.running:
+            job = self._next_job()
+            if job is None:
+                break
+            kind, text, result = job
+            if kind == 'warm':
+                continue
+            try:
+                if kind == 'say':
+                    self._set_speaking(True, text)
+                    with metrics.time('speak'):
+                        if not self._play_cached(text):
+                            self.engine.say(text)
+                            self.engine.runAndWait()
+                elif result.set_running_or_notify_cancel():
+                    wav = self.audio_cache.get(text)
+                    if wav is None:
+                        with metrics.time('tts_render'):
+                            wav = self._render(text)
+                        self.audio_cache.put(text, wav)
+                    result.set_result(wav)
+            except Exception as e:
+                metrics.count_error('tts', e)
+                print(f"Speech error: {e}")
+                if result and not result.done():
+                    result.set_exception(e)
+            finally:
+                if self.speaking:
+                    self._set_speaking(False)
+
+    def _play_cached(self, text):
+        wav = self.audio_cache.get(text) if self.player else None
+        if wav is None:
+            return False
+        try:
+            self.player.play(wav)
+            return True
+        except Exception as e:
+            # Some engines render formats wave cannot read (AIFF on macOS); the engine still works
+            metrics.count_error('tts_play', e)
+            print(f"[TTS]: Cached playback failed, using the engine: {e}")
+            return False
+
+    def _render(self, text):
+        # pyttsx3 can only render to a file path
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(path)
@@ -0,0 +1,150 @@
+import time
+from collections import deque
+
+import numpy as np
+
+
+class Endpointer:
+    """Frame-based voice activity detection and endpointing for 16-bit PCM.
+
+    Speech starts after start_ms of frames above the adaptive noise floor and
+    ends after end_silence_ms below it. Only the speech segment (plus a short
+    pre-roll) is returned, so the recognizer never sees leading silence.
+
+    The floor is seeded from the first seed_ms of audio and then follows the
+    minimum level over the last noise_window_ms, so it can rise to a louder
+    room as well as fall to a quieter one. Inside speech it rises by at most
+    speech_rise_db_per_s, so a long utterance is not mistaken for room noise
+    while a room that got louder still ends the segment eventually.
+    """
+
+    def __init__(self, sample_rate, frame_ms=20, margin_db=10.0, min_db=-55.0,
+                 start_ms=60, end_silence_ms=600, pre_roll_ms=200, max_speech_s=12.0,
+                 seed_ms=200, noise_window_ms=2000, speech_rise_db_per_s=2.0):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.end_frames = max(1, end_silence_ms // frame_ms)
+        self.pre_roll_frames = pre_roll_ms // frame_ms
+        self.max_frames = int(max_speech_s * 1000 / frame_ms)
+        self.seed_frames = max(1, seed_ms // frame_ms)
+        self.speech_rise_db = speech_rise_db_per_s * frame_ms / 1000.0
+        # Recent frame levels for minimum tracking, kept across utterances with the floor
+        self.recent = deque(maxlen=max(self.seed_frames, noise_window_ms // frame_ms))
+        self.noise_db = None
+        self.reset()
+
+    def reset(self, keep_noise=False):
+        """Prepare for the next utterance, optionally keeping the learned noise floor"""
+        if not keep_noise:
+            self.noise_db = None
+            self.recent.clear()
+        self.remainder = b''
+        self.pre_roll = []
+        self.in_speech = False
+        self.voiced_run = 0
+        self.silent_run = 0
+        self.speech_frames = 0
+        self.done = False
+        self.cpu_seconds = 0.0
+
+    def feed(self, pcm):
+        """Consume raw PCM; returns (speech bytes to forward, utterance finished)"""
+        if self.done:
+            return b'', True
+        started = time.perf_counter()
+
+        data = self.remainder + pcm
+        usable = len(data) - len(data) % (self.frame_len * 2)
+        self.remainder = data[usable:]
+        if not usable:
+            return b'', False
+
+        frames = np.frombuffer(data[:usable], dtype=np.int16).reshape(-1, self.frame_len)
+        levels = self.frame_levels(frames)
+        raw = data[:usable]
+        frame_bytes = self.frame_len * 2
+        out = []
+
+        for i, level in enumerate(levels):
+            frame = raw[i * frame_bytes:(i + 1) * frame_bytes]
+            self.track_noise(level)
+
+            if self.noise_db is None:
+                # Still seeding the floor: keep the audio as pre-roll, decide nothing yet
+                self.pre_roll.append(frame)
+                if len(self.pre_roll) > self.pre_roll_frames + self.start_frames:
+                    self.pre_roll.pop(0)
+                continue
+
+            voiced = self.is_voiced(level)
+
+            if not self.in_speech:
+                self.pre_roll.append(frame)
+                if len(self.pre_roll) > self.pre_roll_frames + self.start_frames:
+                    self.pre_roll.pop(0)
+                self.voiced_run = self.voiced_run + 1 if voiced else 0
+                if not voiced:
+                    self.update_noise(level)
+                if self.voiced_run >= self.start_frames:
+                    self.in_speech = True
+                    self.speech_frames = len(self.pre_roll)
+                    out.extend(self.pre_roll)
+                    self.pre_roll = []
+                continue
+
+            out.append(frame)
+            self.speech_frames += 1
+            if voiced:
+                self.silent_run = 0
+            else:
+                self.silent_run += 1
+            if self.silent_run >= self.end_frames or self.speech_frames >= self.max_frames:
+                self.done = True
+                break
+
+        self.cpu_seconds += time.perf_counter() - started
+        return b''.join(out), self.done
+
+    def frame_levels(self, frames):
+        """RMS level of every frame in dBFS"""
+        samples = frames.astype(np.float32) / 32768.0
+        rms = np.sqrt(np.mean(samples ** 2, axis=1))
+        return 20 * np.log10(rms + 1e-9)
+
+    def is_voiced(self, level):
+        floor = self.noise_db if self.noise_db is not None else self.min_db
+        return level > max(floor + self.margin_db, self.min_db)
+
+    def track_noise(self, level):
+        self.recent.append(level)
+        if self.noise_db is None:
+            if len(self.recent) >= self.seed_frames:
+                self.noise_db = float(min(self.recent))
+            return
+        # Minimum statistics: a floor below the quietest recent frame means the room got louder
+        if len(self.recent) == self.recent.maxlen:
+            quietest = min(self.recent)
+            if quietest > self.noise_db:
+                if self.in_speech:
+                    quietest = min(quietest, self.noise_db + self.speech_rise_db)
+                self.noise_db = quietest
+
+    def update_noise(self, level):
+        # Slow moving average so speech onsets do not raise the floor
+        if self.noise_db is None:
+            self.noise_db = level
+        else:
+            self.noise_db = 0.95 * self.noise_db + 0.05 * level
+
+    def report(self):
+        """Segment length, end-of-speech to endpoint delay (audio time) and VAD CPU time"""
+        return {
+            "speech_ms": self.speech_frames * self.frame_ms,
+            "endpoint_latency_ms": self.silent_run * self.frame_ms if self.done else None,
+            "vad_cpu_ms": round(self.cpu_seconds * 1000, 3),
+            "noise_db": round(float(self.noise_db), 1) if self.noise_db is not None else None
+        }
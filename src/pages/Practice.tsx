@@ -26,10 +26,21 @@ import {
 } from "lucide-react"
 import axios from "axios"
 
+// Per-tab Karen session id, so each learner gets their own Karen session
+const getSessionId = () => {
+  let sessionId = sessionStorage.getItem("karenSessionId")
+  if (!sessionId) {
+    sessionId = crypto.randomUUID().replace(/-/g, "")
+    sessionStorage.setItem("karenSessionId", sessionId)
+  }
+  return sessionId
+}
+
 // Create axios instance with timeout
 const api = axios.create({
   baseURL: "http://localhost:5000",
   timeout: 15000, // 15 second timeout
+  headers: { "X-Session-Id": getSessionId() },
 })
 
 // Sample data for practice - matching Karen's animals
@@ -343,9 +354,43 @@ export default function SpeechPractice() {
 
   useEffect(() => {
     checkSystemStatus()
-    // Check status every 5 seconds
-    const interval = setInterval(checkSystemStatus, 5000)
-    return () => clearInterval(interval)
+
+    // Status is pushed by the server; fall back to polling only while the stream is down
+    let interval: NodeJS.Timeout | null = null
+    const source = new EventSource(`${api.defaults.baseURL}/api/status/stream?session_id=${getSessionId()}`)
+
+    source.onopen = () => {
+      if (interval) {
+        clearInterval(interval)
+        interval = null
+      }
+    }
+
+    source.onmessage = (event) => {
+      const delta = JSON.parse(event.data)
+      if ("active" in delta) setSystemActive(delta.active)
+      if ("message" in delta) setMessage(delta.message)
+      setKarenStatus((prev) => {
+        const next = { ...prev }
+        if ("current_animal" in delta) next.current_animal = delta.current_animal
+        if ("camera_active" in delta) next.camera_active = delta.camera_active
+        if ("karen_status" in delta) next.karen_status = delta.karen_status
+        if ("last_heard" in delta) next.last_heard = delta.last_heard || ""
+        if ("listening" in delta) next.listening = delta.listening || false
+        return next
+      })
+    }
+
+    source.onerror = () => {
+      if (!interval) {
+        interval = setInterval(checkSystemStatus, 5000)
+      }
+    }
+
+    return () => {
+      source.close()
+      if (interval) clearInterval(interval)
+    }
   }, [])
 
   // Enhanced voice analysis with Karen integration
@@ -1185,6 +1230,13 @@ export default function SpeechPractice() {
                     <h3 className="text-base sm:text-lg font-semibold text-rose-800 mb-4">Karen's Camera View</h3>
                     <div className="relative bg-gray-100 rounded-lg overflow-hidden aspect-video">
                       <video ref={videoRef} autoPlay muted className="w-full h-full object-cover" />
+                      {karenStatus.camera_active && (
+                        <img
+                          src={`${api.defaults.baseURL}/api/camera/stream?session_id=${getSessionId()}`}
+                          alt="Karen camera"
+                          className="absolute inset-0 w-full h-full object-cover"
+                        />
+                      )}
                       {!karenStatus.camera_active && (
                         <div className="absolute inset-0 flex items-center justify-center bg-gray-200">
                           <div className="text-center">
@@ -0,0 +1,17 @@
+import pytest
+
+from benchmarks.fakes import synthetic_word
+from speechRecognition.pronunciation import LEXICON, PronunciationScorer
+from speechRecognition.speech import EXCELLENT_SCORE, GOOD_SCORE
+
+
+@pytest.mark.parametrize('word', sorted(LEXICON))
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_good_clip_clears_excellent(word, seed):
+    result = PronunciationScorer().score(synthetic_word(word, seed=seed), word)
+    assert result["score"] >= EXCELLENT_SCORE
+
+
+@pytest.mark.parametrize('said, target', [('snake', 'lion'), ('lion', 'snake'), ('rainbow', 'snake')])
+def test_wrong_word_scores_below_good(said, target):
+    assert PronunciationScorer().score(synthetic_word(said), target)["score"] < GOOD_SCORE
@@ -0,0 +1,33 @@
+import wave
+
+import pytest
+
+from benchmarks.fakes import SAMPLE_RATE, write_utterance_wav
+from speechRecognition.vad import Endpointer
+
+
+def endpoint(path, endpointer):
+    """Feed a WAV through the endpointer in microphone-sized chunks, returns its report"""
+    endpointer.reset(keep_noise=True)
+    with wave.open(path, 'rb') as f:
+        pcm = f.readframes(f.getnframes())
+    for i in range(0, len(pcm), 2048):
+        _, done = endpointer.feed(pcm[i:i + 2048])
+        if done:
+            break
+    return endpointer.report()
+
+
+@pytest.mark.parametrize('speech_s', [1, 2, 5, 8])
+def test_long_utterance_is_not_cut_short(tmp_path, speech_s):
+    path = write_utterance_wav(str(tmp_path / 'utterance.wav'), speech_s=speech_s)
+    report = endpoint(path, Endpointer(SAMPLE_RATE))
+    assert report["speech_ms"] >= speech_s * 1000
+    assert report["endpoint_latency_ms"] == 600
+
+
+def test_floor_after_long_utterance_keeps_next_one(tmp_path):
+    endpointer = Endpointer(SAMPLE_RATE)
+    endpoint(write_utterance_wav(str(tmp_path / 'long.wav'), speech_s=5), endpointer)
+    report = endpoint(write_utterance_wav(str(tmp_path / 'short.wav'), speech_s=1), endpointer)
+    assert report["speech_ms"] >= 1000